@@ -1,3 +1,4 @@
+import io
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -58,6 +59,24 @@ def render_insights_section(tab_name, tab_display_name):
             if save_insights(st.session_state.insights):
                 st.rerun()
 
+def to_csv_bytes(df):
+    """Encode a DataFrame as CSV bytes for download"""
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data(ttl=300)
+def get_tables_metadata(_conn):
+    """Get row count and column names for every table in one catalog query"""
+    rows = _conn.execute("""
+        SELECT t.table_name, t.estimated_size, list(c.column_name ORDER BY c.column_index)
+        FROM duckdb_tables() t
+        JOIN duckdb_columns() c ON c.table_oid = t.table_oid
+        WHERE t.schema_name = 'main'
+        GROUP BY t.table_name, t.estimated_size
+    """).fetchall()
+    return {name: (count, columns) for name, count, columns in rows}
+
 # --- DATA LOADING ---
 ats_data_path = DATA_DIR / 'ats_data.parquet'
 if not ats_data_path.exists():
@@ -434,7 +453,7 @@ with tab_sql:
                         col_type = str(sample[col].dtype)
                         st.code(f"{col} ({col_type})", language=None)
                     
-                    count = conn.execute(f"SELECT COUNT(*) as cnt FROM {selected_table}").df()['cnt'].iloc[0]
+                    count = conn.execute(f"SELECT COUNT(*) FROM {selected_table}").fetchone()[0]
                     st.markdown(f"**Rows:** {count:,}")
                     
                     st.markdown("**Sample Data:**")
@@ -451,7 +470,7 @@ with tab_sql:
 SELECT department, 
        COUNT(*) as offers,
        AVG(offer_base) as avg_base,
-       SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) as accepted
+       COUNT(*) FILTER (WHERE status = 'Accepted') as accepted
 FROM ats_data
 GROUP BY department
 ORDER BY offers DESC
@@ -467,7 +486,7 @@ ORDER BY level
             "Win Rate by Source": """
 SELECT source,
        COUNT(*) as total_offers,
-       SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as win_rate_pct
+       COUNT(*) FILTER (WHERE status = 'Accepted') * 100.0 / COUNT(*) as win_rate_pct
 FROM ats_data
 GROUP BY source
 ORDER BY win_rate_pct DESC
@@ -482,11 +501,11 @@ ORDER BY win_rate_pct DESC
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        default_query = st.session_state.get('sql_query', '')
+        st.session_state.setdefault('sql_query', '')
         query = st.text_area(
             "Enter your SQL query:",
-            value=default_query,
             height=200,
+            key='sql_query',
             help="Write SQL queries against the available tables."
         )
         
@@ -494,23 +513,19 @@ ORDER BY win_rate_pct DESC
         with col_btn1:
             run_query = st.button("▶️ Run Query", type="primary", use_container_width=True)
         with col_btn2:
-            if st.button("🗑️ Clear", use_container_width=True):
-                st.session_state['sql_query'] = ''
-                st.rerun()
+            st.button("🗑️ Clear", use_container_width=True,
+                      on_click=lambda: st.session_state.update(sql_query=''))
     
     with col2:
         st.header("📊 Available Tables")
-        for table in tables:
+        tables_meta = get_tables_metadata(conn)
+        for table in [t for t in tables if t in tables_meta]:
+            count, columns = tables_meta[table]
             with st.expander(f"📋 {table}"):
-                try:
-                    count = conn.execute(f"SELECT COUNT(*) as cnt FROM {table}").df()['cnt'].iloc[0]
-                    st.markdown(f"**Rows:** {count:,}")
-                    sample = conn.execute(f"SELECT * FROM {table} LIMIT 0").df()
-                    st.markdown("**Columns:**")
-                    for col in sample.columns:
-                        st.text(f"  • {col}")
-                except:
-                    st.text("Click to explore")
+                st.markdown(f"**Rows:** {count:,}")
+                st.markdown("**Columns:**")
+                for col in columns:
+                    st.text(f"  • {col}")
     
     # Execute query
     if run_query and query:
@@ -520,13 +535,13 @@ ORDER BY win_rate_pct DESC
             
             st.success(f"✅ Query executed successfully! Returned {len(result_df)} rows.")
             
-            # Download button
-            csv = result_df.to_csv(index=False)
+            # Download button - CSV is only encoded when clicked
             st.download_button(
                 label="📥 Download as CSV",
-                data=csv,
+                data=lambda: to_csv_bytes(result_df),
                 file_name="query_results.csv",
-                mime="text/csv"
+                mime="text/csv",
+                on_click="ignore"
             )
             
             # Display results
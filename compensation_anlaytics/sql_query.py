@@ -2,6 +2,7 @@
 Streamlit page for interactive SQL queries with schema navigator
 Run: streamlit run sql_query.py
 """
+import io
 import streamlit as st
 import pandas as pd
 import duckdb
@@ -28,15 +29,36 @@ def get_db_connection():
 
 conn = get_db_connection()
 
+@st.cache_data(ttl=300)
+def get_tables_metadata():
+    """Get name, row count and column count for all tables in one catalog query"""
+    return get_db_connection().execute("""
+        SELECT table_name AS name, estimated_size AS rows, column_count AS col_count
+        FROM duckdb_tables()
+        WHERE schema_name = 'main'
+        ORDER BY table_name
+    """).df()
+
+tables_df = get_tables_metadata()
+tables = tables_df['name'].tolist()
+
+def select_table_from_list():
+    """Show the table picked in the Available Tables list in the schema navigator"""
+    rows = st.session_state['tables_list'].selection.rows
+    if rows:
+        st.session_state['selected_table'] = tables_df['name'].iloc[rows[0]]
+
+def to_csv_bytes(df):
+    """Encode a DataFrame as CSV bytes for download"""
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False)
+    return buf.getvalue()
+
 # Sidebar with schema navigator
 with st.sidebar:
     st.header("📊 Schema Navigator")
     
-    # Get table list
-    tables_result = conn.execute("SHOW TABLES").df()
-    tables = tables_result['name'].tolist() if len(tables_result) > 0 else []
-    
-    selected_table = st.selectbox("Select a table:", [""] + tables)
+    selected_table = st.selectbox("Select a table:", [""] + tables, key="selected_table")
     
     if selected_table:
         st.markdown(f"### Table: `{selected_table}`")
@@ -52,7 +74,7 @@ with st.sidebar:
                     st.code(f"{col} ({col_type})", language=None)
                 
                 # Show row count
-                count = conn.execute(f"SELECT COUNT(*) as cnt FROM {selected_table}").df()['cnt'].iloc[0]
+                count = conn.execute(f"SELECT COUNT(*) FROM {selected_table}").fetchone()[0]
                 st.markdown(f"**Rows:** {count:,}")
                 
                 # Show sample data
@@ -77,7 +99,7 @@ with st.sidebar:
 SELECT department, 
        COUNT(*) as offers,
        AVG(offer_base) as avg_base,
-       SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) as accepted
+       COUNT(*) FILTER (WHERE status = 'Accepted') as accepted
 FROM ats_data
 GROUP BY department
 ORDER BY offers DESC
@@ -94,7 +116,7 @@ ORDER BY level
         "Win Rate by Source": """
 SELECT source,
        COUNT(*) as total_offers,
-       SUM(CASE WHEN status = 'Accepted' THEN 1 ELSE 0 END) * 100.0 / COUNT(*) as win_rate_pct
+       COUNT(*) FILTER (WHERE status = 'Accepted') * 100.0 / COUNT(*) as win_rate_pct
 FROM ats_data
 GROUP BY source
 ORDER BY win_rate_pct DESC
@@ -134,11 +156,11 @@ with col1:
     st.header("SQL Query")
     
     # Query input
-    default_query = st.session_state.get('sql_query', '')
+    st.session_state.setdefault('sql_query', '')
     query = st.text_area(
         "Enter your SQL query:",
-        value=default_query,
         height=200,
+        key='sql_query',
         help="Write SQL queries against the available tables. Use the schema navigator on the left to explore tables."
     )
     
@@ -148,32 +170,32 @@ with col1:
         run_query = st.button("▶️ Run Query", type="primary", use_container_width=True)
     
     with col_btn2:
-        if st.button("🗑️ Clear", use_container_width=True):
-            st.session_state['sql_query'] = ''
-            st.rerun()
+        st.button("🗑️ Clear", use_container_width=True,
+                  on_click=lambda: st.session_state.update(sql_query=''))
     
     with col_btn3:
+        # The editor is bound to st.session_state['sql_query'], so it is already kept
         if st.button("💾 Save Query", use_container_width=True):
             if query:
-                st.session_state['sql_query'] = query
                 st.success("Query saved!")
 
 with col2:
     st.header("📊 Available Tables")
     
-    for table in tables:
-        with st.expander(f"📋 {table}"):
-            try:
-                count = conn.execute(f"SELECT COUNT(*) as cnt FROM {table}").df()['cnt'].iloc[0]
-                st.markdown(f"**Rows:** {count:,}")
-                
-                # Get column names
-                sample = conn.execute(f"SELECT * FROM {table} LIMIT 0").df()
-                st.markdown("**Columns:**")
-                for col in sample.columns:
-                    st.text(f"  • {col}")
-            except:
-                st.text("Click to explore")
+    # Select a row to open the table in the schema navigator
+    st.dataframe(
+        tables_df,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            'name': 'Table',
+            'rows': st.column_config.NumberColumn("Rows", format="%d"),
+            'col_count': st.column_config.NumberColumn("Columns", format="%d")
+        },
+        key="tables_list",
+        on_select=select_table_from_list,
+        selection_mode="single-row"
+    )
 
 # Execute query
 if run_query and query:
@@ -186,13 +208,13 @@ if run_query and query:
         # Display results
         st.header("Query Results")
         
-        # Show download button
-        csv = result_df.to_csv(index=False)
+        # Show download button - CSV is only encoded when clicked
         st.download_button(
             label="📥 Download as CSV",
-            data=csv,
+            data=lambda: to_csv_bytes(result_df),
             file_name="query_results.csv",
-            mime="text/csv"
+            mime="text/csv",
+            on_click="ignore"
         )
         
         # Display dataframe
@@ -7,7 +7,9 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import duckdb
+import pyarrow as pa
 import os
+import tempfile
 from pathlib import Path
 
 # Import analysis functions
@@ -18,6 +20,92 @@ SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / 'data'
 DB_PATH = DATA_DIR / 'interview_analytics.duckdb'
 
+# Shared read-only connection; callers take their own .cursor()
+@st.cache_resource
+def get_ro_conn() -> duckdb.DuckDBPyConnection:
+    """Get cached read-only database connection"""
+    return science.get_db_connection()
+
+
+@st.cache_data(ttl=300)
+def _cached_summary_stats() -> dict:
+    """Summary stats for the header, refreshed at most every 5 minutes"""
+    return science.get_summary_stats()
+
+
+@st.cache_data(ttl=3600)
+def _departments() -> list:
+    """Department filter options, refreshed at most hourly"""
+    return ['All'] + science.get_departments()
+
+
+@st.cache_data
+def _has_history() -> bool:
+    """Whether the application_history table has been loaded"""
+    return get_ro_conn().cursor().execute(
+        "SELECT 1 FROM information_schema.tables WHERE table_name = 'application_history'"
+    ).fetchone() is not None
+
+
+@st.cache_data
+def _stage_reached_source() -> str:
+    """One row per (application, stage) with its stage_group: app_stage_reached if built, else derived inline"""
+    has_table = get_ro_conn().cursor().execute(
+        "SELECT 1 FROM information_schema.tables WHERE table_name = 'app_stage_reached'"
+    ).fetchone() is not None
+    if has_table:
+        return "app_stage_reached"
+    return """(
+        SELECT DISTINCT application_id, stage_name,
+            CASE WHEN stage_name ILIKE '%onsite%' OR stage_name IN ('All Around', 'Work Trial')
+                 THEN 'Onsite' ELSE stage_name END as stage_group
+        FROM application_history
+    )"""
+
+
+@st.cache_data
+def _cohort_sources() -> tuple:
+    """(onsite, offer) application-id sources: the materialized cohort tables if built, else derived inline"""
+    has_tables = get_ro_conn().cursor().execute(
+        "SELECT COUNT(*) FROM information_schema.tables "
+        "WHERE table_name IN ('onsite_application_ids', 'offer_application_ids')"
+    ).fetchone()[0] == 2
+    if has_tables:
+        return "onsite_application_ids", "offer_application_ids"
+    return (
+        """(
+        SELECT DISTINCT application_id FROM application_history
+        WHERE stage_name ILIKE '%onsite%' OR stage_name IN ('All Around', 'Work Trial')
+    )""",
+        """(
+        SELECT DISTINCT application_id FROM application_history
+        WHERE stage_name ILIKE '%offer%'
+    )""",
+    )
+
+
+def _applications_source() -> str:
+    """
+    Applications relation for filtered scans: the exported Parquet copy if present, else the table.
+    Not cached, so an export (or its removal) after startup is picked up on the next rerun.
+    """
+    if science.APPLICATIONS_PARQUET.exists():
+        return f"read_parquet('{science.APPLICATIONS_PARQUET}')"
+    return "applications"
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def _analyze_feedback_themes(feedback_texts: list, analysis_type: str) -> dict:
+    """
+    OpenAI theme analysis, cached so repeat clicks on the same feedback are free.
+    A failed analysis raises instead of returning, so it is never cached.
+    """
+    analysis = science.analyze_feedback_themes(feedback_texts, analysis_type)
+    if analysis.get('error'):
+        raise RuntimeError(analysis.get('summary', 'Analysis failed'))
+    return analysis
+
+
 # Page config
 st.set_page_config(
     page_title="Interview Analytics",
@@ -36,7 +124,7 @@ st.title("📊 Interview Analytics Dashboard")
 
 # Get summary stats
 try:
-    stats = science.get_summary_stats()
+    stats = _cached_summary_stats()
     
     # Key metrics row
     col1, col2, col3, col4, col5 = st.columns(5)
@@ -59,7 +147,8 @@ tab_summary, tab1, tab2, tab3, tab4, tab5, tab7 = st.tabs([
     "⚖️ Interviewer Calibration",
     "⚠️ False Positives",
     "🔎 SQL Query"
-])
+], key="active_tab", on_change="rerun")
+# With a tracked tab, each tab's .open is set and only the selected analysis tab runs its queries
 
 # =============================================================================
 # SUMMARY TAB (First Tab)
@@ -106,18 +195,18 @@ with tab_summary:
     st.subheader("📊 Key Metrics")
     
     try:
-        conn = duckdb.connect(str(DB_PATH), read_only=True)
+        cur = get_ro_conn().cursor()
         
         col1, col2, col3, col4 = st.columns(4)
         
-        total_apps = conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
-        total_hired = conn.execute("SELECT COUNT(*) FROM applications WHERE status = 'Hired'").fetchone()[0]
-        total_feedback = conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+        total_apps = cur.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+        total_hired = cur.execute("SELECT COUNT(*) FROM applications WHERE status = 'Hired'").fetchone()[0]
+        total_feedback = cur.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
         
         # Check for history coverage
-        has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
+        has_history = _has_history()
         if has_history:
-            history_coverage = conn.execute("SELECT COUNT(DISTINCT application_id) FROM application_history").fetchone()[0]
+            history_coverage = cur.execute("SELECT COUNT(DISTINCT application_id) FROM application_history").fetchone()[0]
         else:
             history_coverage = 0
         
@@ -126,8 +215,6 @@ with tab_summary:
         col3.metric("Feedback Entries", f"{total_feedback:,}")
         col4.metric("History Coverage", f"{history_coverage:,} / {total_apps:,}")
         
-        conn.close()
-        
     except Exception as e:
         st.error(f"Error loading metrics: {e}")
     
@@ -193,16 +280,179 @@ with tab_summary:
 # =============================================================================
 # TAB 1: FUNNEL RATIOS
 # =============================================================================
-with tab1:
+# Funnel position of each consolidated stage (onsite variants fold into 'Onsite')
+STAGE_ORDER = {
+    'New Lead': 0, 'Application Review': 1, 'Reached Out': 2,
+    'Replied': 3, 'Intro Call': 4, 'Coding 1': 5,
+    'Hiring Manager Screen': 6, 'Technical Interview 1': 7,
+    'Technical Interview 2': 8, 'Recruiter Screen': 9,
+    'Technical Deep Dive': 10, 'Coding 2': 11,
+    'Onsite': 12, 'Offer': 13, 'Hired': 14
+}
+# VALUES rows for the stage_order CTE, rendered once at import
+STAGE_ORDER_VALUES = ", ".join(f"('{stage}', {ord_})" for stage, ord_ in STAGE_ORDER.items())
+
+# Stages shown in the simplified funnel view
+KEY_STAGES = ['New Lead', 'Application Review', 'Intro Call', 'Coding 1', 'Onsite', 'Offer', 'Hired']
+KEY_STAGES_SQL = ", ".join(f"'{stage}'" for stage in KEY_STAGES)
+
+# Static layout for the funnel bar chart, shared across reruns
+FUNNEL_LAYOUT = dict(
+    title_text="Candidates Who Reached Each Stage",
+    xaxis_title="Number of Candidates",
+    yaxis=dict(autorange="reversed"),  # Top to bottom
+    height=400,
+    showlegend=False,
+    margin=dict(l=150, r=20, t=40, b=40)
+)
+
+
+def _filtered_history_cte() -> str:
+    """filtered_hist CTE: reached-stage rows for the selected department (binds dept twice)"""
+    return f"""filtered_hist AS (
+        SELECT h.*
+        FROM {_stage_reached_source()} h
+        LEFT JOIN applications a ON h.application_id = a.id
+        WHERE (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
+    )"""
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _funnel_summary(dept):
+    """Key-stage funnel counts and metrics plus Onsite/Offer/Hired totals from a single round-trip"""
+    summary_query = f"""
+    WITH {_filtered_history_cte()},
+    stage_order(stage, ord) AS (VALUES {STAGE_ORDER_VALUES}),
+    reached AS (
+        SELECT 
+            CASE 
+                WHEN h.stage_name IN ('Onsite', 'All Around', 'Work Trial') THEN 'Onsite'
+                ELSE h.stage_name
+            END as stage_name,
+            COUNT(DISTINCT h.application_id) as reached
+        FROM filtered_hist h
+        WHERE CASE 
+            WHEN h.stage_name IN ('Onsite', 'All Around', 'Work Trial') THEN 'Onsite'
+            ELSE h.stage_name
+        END IN ({KEY_STAGES_SQL})
+        GROUP BY 1
+    ),
+    funnel AS (
+        SELECT s.stage as stage_name, s.ord, f.reached
+        FROM stage_order s
+        JOIN reached f ON f.stage_name = s.stage
+    ),
+    funnel_metrics AS (
+        SELECT 
+            stage_name, ord, reached,
+            -- Cumulative % uses max as starting point
+            ROUND(reached * 100.0 / MAX(reached) OVER (), 1)::DOUBLE as cumulative_pct,
+            -- Dropoff = how many dropped from previous stage
+            COALESCE(LAG(reached) OVER (ORDER BY ord) - reached, 0) as dropoff,
+            -- Stage Conv = % that made it TO the next stage (last row has no next)
+            COALESCE(ROUND(LEAD(reached) OVER (ORDER BY ord) * 100.0 / reached, 1), 0)::DOUBLE as stage_conversion
+        FROM funnel
+    ),
+    totals AS (
+        SELECT 
+            COUNT(DISTINCT h.application_id) FILTER (WHERE h.stage_group = 'Onsite') as reached_onsite,
+            COUNT(*) FILTER (WHERE h.stage_name = 'Offer') as reached_offer,
+            COUNT(*) FILTER (WHERE h.stage_name = 'Hired') as reached_hired
+        FROM filtered_hist h
+    )
+    SELECT 'funnel' as kind, stage_name, ord as "order", reached,
+           cumulative_pct, dropoff, stage_conversion
+    FROM funnel_metrics
+    UNION ALL
+    SELECT 'totals', stage_name, 0, reached, 0, 0, 0
+    FROM (UNPIVOT totals ON reached_onsite, reached_offer, reached_hired INTO NAME stage_name VALUE reached)
+    ORDER BY kind, "order"
+    """
+    summary = get_ro_conn().cursor().execute(summary_query, [dept, dept]).df()
+    
+    # Split the labelled result sets back apart
+    funnel_df = summary[summary['kind'] == 'funnel'].drop(columns='kind').reset_index(drop=True)
+    totals = summary[summary['kind'] == 'totals'].set_index('stage_name')['reached']
+    stage_totals = tuple(int(totals[c]) for c in ('reached_onsite', 'reached_offer', 'reached_hired'))
+    return funnel_df, stage_totals
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _interviewer_stats(dept):
+    """Interviewers per candidate, summarised by stage"""
+    interviewer_stats_query = f"""
+    WITH {_filtered_history_cte()},
+    candidate_stage_interviewers AS (
+        SELECT 
+            h.stage_name,
+            h.application_id,
+            COUNT(DISTINCT f.interviewer_id) as interviewer_count
+        FROM filtered_hist h
+        JOIN feedback f ON h.application_id = f.application_id
+        WHERE f.interviewer_id IS NOT NULL
+        AND h.stage_name NOT IN ('Jordan 1:1', 'Archived', 'Application Review', 'Reached Out', 'Intro Call', 'New Lead', 'Replied')
+        GROUP BY h.stage_name, h.application_id
+    ),
+    stage_stats AS (
+        SELECT 
+            stage_name,
+            COUNT(DISTINCT application_id) as candidates,
+            SUM(interviewer_count) as total_interviews,
+            MIN(interviewer_count) as min_interviewers,
+            MAX(interviewer_count) as max_interviewers,
+            ROUND(AVG(interviewer_count), 1) as avg_interviewers,
+            approx_quantile(interviewer_count, 0.5) as median_interviewers
+        FROM candidate_stage_interviewers
+        GROUP BY stage_name
+        HAVING COUNT(DISTINCT application_id) >= 5
+    )
+    SELECT 
+        stage_name as "Stage",
+        candidates as "Candidates",
+        total_interviews as "Total Interviews",
+        min_interviewers as "Min",
+        max_interviewers as "Max",
+        avg_interviewers as "Avg",
+        median_interviewers as "Median"
+    FROM stage_stats
+    ORDER BY candidates DESC
+    """
+    # Arrow-backed columns share DuckDB's result buffers instead of copying to numpy
+    return (get_ro_conn().cursor().execute(interviewer_stats_query, [dept, dept])
+            .to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype))
+
+
+@st.cache_data(show_spinner=False)
+def _interviewer_fig(stats_df):
+    """Average-interviewers bar chart, rebuilt only when the stats change"""
+    # Plotly has no WebGL bar trace; keep the SVG payload small instead
+    fig = px.bar(
+        stats_df[['Stage', 'Avg', 'Candidates', 'Min', 'Max', 'Median']],
+        x='Stage',
+        y='Avg',
+        color='Avg',
+        title="Average Interviewers per Candidate by Stage",
+        color_continuous_scale='Blues',
+        hover_data=['Candidates', 'Min', 'Max', 'Median']
+    )
+    fig.update_layout(yaxis_title="Avg Interviewers per Candidate")
+    return fig
+
+
+@st.fragment
+def render_funnel_tab():
+    """Funnel Ratios tab; reruns on its own when the department changes"""
     st.header("📈 Funnel Ratios")
     st.markdown("**Hypothesis:** For certain departments, there is a steep dropoff from Onsite to Offer stage.")
     
     # Department filter
-    departments = ['All'] + science.get_departments()
-    selected_dept = st.selectbox("Filter by Department:", departments, key="funnel_dept")
+    selected_dept = st.selectbox("Filter by Department:", _departments(), key="funnel_dept")
     
     dept_filter = None if selected_dept == 'All' else selected_dept
     
+    # One cursor on the shared connection for every query in this tab
+    conn = get_ro_conn().cursor()
+    
     try:
         funnel_data = science.calculate_funnel_ratios(dept_filter)
         
@@ -215,147 +465,77 @@ with tab1:
         
         st.markdown("---")
         
+        # Check once if we have application_history table for accurate funnel
+        has_history = _has_history()
+        funnel_df, stage_totals = _funnel_summary(dept_filter) if has_history else (None, None)
+        
         # Funnel visualization - Sankey Diagram
         col1, col2 = st.columns([2, 1])
         
         with col1:
             st.subheader("📊 Interview Funnel")
             
-            conn = duckdb.connect(str(DB_PATH), read_only=True)
-            
-            # Check if we have application_history table for accurate funnel
-            has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
-            
             if has_history:
                 # Use accurate history-based funnel
                 st.caption("*Using stage transition history*")
                 
-                dept_join = f"JOIN applications a ON h.application_id = a.id WHERE a.department = '{dept_filter}'" if dept_filter else ""
-                
-                # Count unique apps that reached each stage - consolidate onsite stages
-                funnel_query = f"""
-                SELECT 
-                    CASE 
-                        WHEN h.stage_name IN ('Onsite', 'All Around', 'Work Trial') THEN 'Onsite'
-                        ELSE h.stage_name
-                    END as stage_name,
-                    COUNT(DISTINCT h.application_id) as reached
-                FROM application_history h
-                {dept_join}
-                {'AND' if dept_filter else 'WHERE'} h.stage_name NOT IN ('Archived', 'Jordan 1:1')
-                GROUP BY CASE 
-                    WHEN h.stage_name IN ('Onsite', 'All Around', 'Work Trial') THEN 'Onsite'
-                    ELSE h.stage_name
-                END
-                ORDER BY reached DESC
-                """
-                
-                funnel_df = conn.execute(funnel_query).df()
-                conn.close()
                 
                 if len(funnel_df) > 1:
-                    # Define funnel order - ensures Onsite, Offer, Hired are included
-                    stage_order = {
-                        'New Lead': 0, 'Application Review': 1, 'Reached Out': 2, 
-                        'Replied': 3, 'Intro Call': 4, 'Coding 1': 5, 
-                        'Hiring Manager Screen': 6, 'Technical Interview 1': 7,
-                        'Technical Interview 2': 8, 'Recruiter Screen': 9,
-                        'Technical Deep Dive': 10, 'Coding 2': 11,
-                        'Onsite': 12, 'All Around': 12, 'Work Trial': 12,
-                        'Offer': 13, 'Hired': 14
-                    }
-                    funnel_df['order'] = funnel_df['stage_name'].map(lambda x: stage_order.get(x, 99))
+                    # Already filtered to key stages and sorted in funnel order;
+                    # create horizontal funnel bar chart
+                    fig = go.Figure()
                     
-                    # Keep only stages in our defined order (drops misc stages)
-                    funnel_df = funnel_df[funnel_df['order'] < 99]
-                    funnel_df = funnel_df.sort_values('order')
+                    # Add horizontal bars
+                    fig.add_trace(go.Bar(
+                        y=funnel_df['stage_name'],
+                        x=funnel_df['reached'],
+                        orientation='h',
+                        marker=dict(
+                            color='#3498db',
+                            line=dict(color='#2980b9', width=1)
+                        ),
+                        text=[f"{c:,}" for c in funnel_df['reached']],
+                        textposition='inside',
+                        textfont=dict(color='white', size=14),
+                        hovertemplate='%{y}<br>Candidates: %{x:,}<extra></extra>'
+                    ))
                     
-                    # Key funnel stages to always show (simplified view)
-                    key_stages = ['New Lead', 'Application Review', 'Intro Call', 'Coding 1', 
-                                   'Onsite', 'Offer', 'Hired']
+                    fig.update_layout(FUNNEL_LAYOUT)
                     
-                    # Filter to key stages that exist in data
-                    key_df = funnel_df[funnel_df['stage_name'].isin(key_stages)].copy()
-                    key_df = key_df.sort_values('order')
+                    # Stable key keeps the same chart element across reruns
+                    st.plotly_chart(fig, use_container_width=True, key="funnel_chart")
                     
-                    if len(key_df) > 0:
-                        # Calculate metrics - use max as starting point for cumulative %
-                        max_stage_count = key_df['reached'].max()
-                        key_df['cumulative_pct'] = (key_df['reached'] / max_stage_count * 100).round(1)
-                        
-                        # Dropoff = how many dropped from previous stage
-                        key_df['dropoff'] = key_df['reached'].shift(1) - key_df['reached']
-                        key_df['dropoff'] = key_df['dropoff'].fillna(0).astype(int)
-                        
-                        # Stage Conv = % that made it TO the next stage (shift -1 to show next/current)
-                        key_df['stage_conversion'] = (key_df['reached'].shift(-1) / key_df['reached'] * 100).round(1)
-                        key_df['stage_conversion'] = key_df['stage_conversion'].fillna(0)  # Last row has no next
-                        
-                        # Create horizontal funnel bar chart
-                        import plotly.graph_objects as go
-                        
-                        fig = go.Figure()
-                        
-                        # Add horizontal bars
-                        fig.add_trace(go.Bar(
-                            y=key_df['stage_name'],
-                            x=key_df['reached'],
-                            orientation='h',
-                            marker=dict(
-                                color='#3498db',
-                                line=dict(color='#2980b9', width=1)
-                            ),
-                            text=[f"{c:,}" for c in key_df['reached']],
-                            textposition='inside',
-                            textfont=dict(color='white', size=14),
-                            hovertemplate='%{y}<br>Candidates: %{x:,}<extra></extra>'
-                        ))
-                        
-                        fig.update_layout(
-                            title_text="Candidates Who Reached Each Stage",
-                            xaxis_title="Number of Candidates",
-                            yaxis=dict(autorange="reversed"),  # Top to bottom
-                            height=400,
-                            showlegend=False,
-                            margin=dict(l=150, r=20, t=40, b=40)
-                        )
-                        
-                        st.plotly_chart(fig, use_container_width=True)
-                        
-                        # Show detailed table below
-                        st.markdown("**Funnel Metrics:**")
-                        display_df = key_df[['stage_name', 'reached', 'cumulative_pct', 'dropoff', 'stage_conversion']].copy()
-                        display_df.columns = ['Stage', 'Candidates', 'Cumulative %', 'Dropoff', 'Stage Conv %']
-                        st.dataframe(
-                            display_df,
-                            use_container_width=True,
-                            hide_index=True,
-                            column_config={
-                                'Candidates': st.column_config.NumberColumn(format="%d"),
-                                'Cumulative %': st.column_config.NumberColumn(format="%.1f%%"),
-                                'Dropoff': st.column_config.NumberColumn(format="▼ %d"),
-                                'Stage Conv %': st.column_config.NumberColumn(format="%.1f%%")
-                            }
-                        )
-                    else:
-                        st.info("No funnel data available")
+                    # Show detailed table below
+                    st.markdown("**Funnel Metrics:**")
+                    display_df = funnel_df[['stage_name', 'reached', 'cumulative_pct', 'dropoff', 'stage_conversion']].rename(
+                        columns={'stage_name': 'Stage', 'reached': 'Candidates', 'cumulative_pct': 'Cumulative %',
+                                 'dropoff': 'Dropoff', 'stage_conversion': 'Stage Conv %'}
+                    )
+                    st.dataframe(
+                        display_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            'Candidates': st.column_config.NumberColumn(format="%d"),
+                            'Cumulative %': st.column_config.NumberColumn(format="%.1f%%"),
+                            'Dropoff': st.column_config.NumberColumn(format="▼ %d"),
+                            'Stage Conv %': st.column_config.NumberColumn(format="%.1f%%")
+                        }
+                    )
                 else:
                     st.info("Not enough stage data for Sankey diagram")
             else:
                 # Fallback to current_stage based view
                 st.caption("*Based on current stage (run update_history.py for accurate funnel)*")
-                dept_where = f"WHERE department = '{dept_filter}'" if dept_filter else ""
-                
-                stage_query = f"""
+                stage_query = """
                 SELECT current_stage_name as stage, COUNT(*) as count
                 FROM applications
-                {dept_where}
+                WHERE (CAST(? AS VARCHAR) IS NULL OR department = ?)
                 GROUP BY current_stage_name
                 ORDER BY count DESC
                 LIMIT 10
                 """
-                stage_df = conn.execute(stage_query).df()
-                conn.close()
+                stage_df = conn.execute(stage_query, [dept_filter, dept_filter]).df()
                 
                 if len(stage_df) > 0:
                     fig = px.bar(stage_df, x='stage', y='count', title="Current Stage Distribution")
@@ -367,44 +547,18 @@ with tab1:
         st.markdown("---")
         st.subheader("🚨 Onsite → Offer Dropoff Analysis")
         
-        conn = duckdb.connect(str(DB_PATH), read_only=True)
-        
-        # Check if we have application_history table
-        has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
-        
-        if has_history:
+        if not has_history:
+            # Fallback message
+            st.warning("⏳ Application history not yet loaded. Run `python update_history.py` to fetch stage transition data for accurate funnel metrics.")
+        elif funnel_df.empty:
+            # Nothing reached a key stage, so there is nothing to break down
+            st.info("No stage history for this filter")
+        else:
             # Use accurate history-based calculation
             st.caption("📊 *Using stage transition history for accurate funnel*")
             
-            # Join with applications for department filter
-            dept_join = f"JOIN applications a ON h.application_id = a.id WHERE a.department = '{dept_filter}'" if dept_filter else ""
-            
             try:
-                # Count unique apps that reached each stage
-                reached_onsite = conn.execute(f"""
-                    SELECT COUNT(DISTINCT h.application_id) 
-                    FROM application_history h
-                    {dept_join}
-                    {'AND' if dept_filter else 'WHERE'} (h.stage_name ILIKE '%onsite%' 
-                        OR h.stage_name = 'All Around'
-                        OR h.stage_name = 'Work Trial')
-                """).fetchone()[0]
-                
-                reached_offer = conn.execute(f"""
-                    SELECT COUNT(DISTINCT h.application_id) 
-                    FROM application_history h
-                    {dept_join}
-                    {'AND' if dept_filter else 'WHERE'} h.stage_name = 'Offer'
-                """).fetchone()[0]
-                
-                reached_hired = conn.execute(f"""
-                    SELECT COUNT(DISTINCT h.application_id) 
-                    FROM application_history h
-                    {dept_join}
-                    {'AND' if dept_filter else 'WHERE'} h.stage_name = 'Hired'
-                """).fetchone()[0]
-                
-                conn.close()
+                reached_onsite, reached_offer, reached_hired = stage_totals
                 
                 col1, col2, col3, col4 = st.columns(4)
                 col1.metric("Reached Onsite", f"{reached_onsite:,}", 
@@ -446,10 +600,6 @@ with tab1:
                     
             except Exception as e:
                 st.error(f"Error calculating dropoff: {e}")
-        else:
-            # Fallback message
-            st.warning("⏳ Application history not yet loaded. Run `python update_history.py` to fetch stage transition data for accurate funnel metrics.")
-            conn.close()
         
         # Interview hours analysis
         st.markdown("---")
@@ -459,51 +609,7 @@ with tab1:
         # Interviewers per stage stats
         st.markdown("#### 👥 Interviewers per Candidate by Stage")
         try:
-            conn = duckdb.connect(str(DB_PATH), read_only=True)
-            
-            dept_filter_sql = f"AND a.department = '{dept_filter}'" if dept_filter else ""
-            
-            interviewer_stats_query = f"""
-            WITH candidate_stage_interviewers AS (
-                SELECT 
-                    h.stage_name,
-                    h.application_id,
-                    COUNT(DISTINCT f.interviewer_id) as interviewer_count
-                FROM application_history h
-                JOIN feedback f ON h.application_id = f.application_id
-                JOIN applications a ON h.application_id = a.id
-                WHERE f.interviewer_id IS NOT NULL
-                {dept_filter_sql}
-                GROUP BY h.stage_name, h.application_id
-            ),
-            stage_stats AS (
-                SELECT 
-                    stage_name,
-                    COUNT(DISTINCT application_id) as candidates,
-                    SUM(interviewer_count) as total_interviews,
-                    MIN(interviewer_count) as min_interviewers,
-                    MAX(interviewer_count) as max_interviewers,
-                    ROUND(AVG(interviewer_count), 1) as avg_interviewers,
-                    PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY interviewer_count) as median_interviewers
-                FROM candidate_stage_interviewers
-                GROUP BY stage_name
-                HAVING COUNT(DISTINCT application_id) >= 5
-            )
-            SELECT 
-                stage_name as "Stage",
-                candidates as "Candidates",
-                total_interviews as "Total Interviews",
-                min_interviewers as "Min",
-                max_interviewers as "Max",
-                avg_interviewers as "Avg",
-                median_interviewers as "Median"
-            FROM stage_stats
-            where stage_name not in ('Jordan 1:1','Archived','Application Review', 'Reached Out', 'Intro Call', 'New Lead', 'Replied')
-            ORDER BY candidates DESC
-            """
-            
-            interviewer_stats = conn.execute(interviewer_stats_query).df()
-            conn.close()
+            interviewer_stats = _interviewer_stats(dept_filter)
             
             if len(interviewer_stats) > 0:
                 # Display as a nicely formatted table
@@ -523,17 +629,8 @@ with tab1:
                 )
                 
                 # Bar chart showing average interviewers per stage
-                fig = px.bar(
-                    interviewer_stats.head(15),
-                    x='Stage',
-                    y='Avg',
-                    color='Avg',
-                    title="Average Interviewers per Candidate by Stage",
-                    color_continuous_scale='Blues',
-                    hover_data=['Candidates', 'Min', 'Max', 'Median']
-                )
-                fig.update_layout(yaxis_title="Avg Interviewers per Candidate")
-                st.plotly_chart(fig, use_container_width=True)
+                fig = _interviewer_fig(interviewer_stats.head(15))
+                st.plotly_chart(fig, use_container_width=True, key="interviewer_chart")
             else:
                 st.info("No interviewer data available for this filter")
         except Exception as e:
@@ -544,10 +641,168 @@ with tab1:
         import traceback
         st.code(traceback.format_exc())
 
+with tab1:
+    if tab1.open:
+        render_funnel_tab()
+
 # =============================================================================
 # TAB 2: PRE-ONSITE SCREENING (Rubric Heatmap)
 # =============================================================================
-with tab2:
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_onsite_bundle(dept):
+    """Rejection reasons, votes and source conversion for onsite candidates, in one roundtrip"""
+    cur = get_ro_conn().cursor()
+    # Arrow-backed frames go to st.dataframe / Plotly without a numpy round trip
+    try:
+        # Onsite candidates in this department, flagged if they also reached an offer.
+        # The temp table lives on this cursor only, so concurrent sessions don't collide.
+        onsite_src, offer_src = _cohort_sources()
+        cur.execute(f"""
+        CREATE TEMP TABLE onsite_apps AS
+        SELECT a.id, a.archive_reason, a.current_stage_name, a.source,
+               ofc.application_id IS NOT NULL as got_offer
+        FROM {_applications_source()} a
+        JOIN {onsite_src} oc ON a.id = oc.application_id
+        LEFT JOIN {offer_src} ofc ON a.id = ofc.application_id
+        WHERE (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
+        """, [dept, dept])
+        
+        # pct is each reason's share of the top 15 shown
+        rejection_df = cur.execute("""
+        SELECT reason, count, ROUND(count * 100.0 / SUM(count) OVER (), 1) as pct
+        FROM (
+            SELECT 
+                CASE WHEN archive_reason IS NULL OR archive_reason = '' 
+                     THEN 'Not Specified' 
+                     ELSE archive_reason 
+                END as reason,
+                COUNT(*) as count
+            FROM onsite_apps
+            WHERE current_stage_name = 'Archived'
+            GROUP BY reason
+            ORDER BY count DESC
+            LIMIT 15
+        )
+        ORDER BY count DESC
+        """).to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+        
+        rating_df = cur.execute("""
+        SELECT 
+            f.vote,
+            COUNT(*) as count
+        FROM feedback f
+        JOIN onsite_apps oa ON f.application_id = oa.id
+        WHERE f.vote IS NOT NULL
+        GROUP BY f.vote
+        ORDER BY count DESC
+        """).to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+        
+        source_df = cur.execute("""
+        SELECT 
+            source,
+            COUNT(*) as reached_onsite,
+            COUNT(*) FILTER (WHERE got_offer) as got_offer,
+            ROUND(COUNT(*) FILTER (WHERE got_offer) * 100.0 / COUNT(*), 1) as offer_rate
+        FROM onsite_apps
+        GROUP BY source
+        HAVING COUNT(*) >= 5
+        ORDER BY offer_rate DESC
+        LIMIT 15
+        """).to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+    finally:
+        cur.close()
+    
+    return rejection_df, rating_df, source_df
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_archived_reasons(dept):
+    """Archive reasons across all archived candidates (no application_history)"""
+    rejection_query = f"""
+    SELECT reason, count, ROUND(count * 100.0 / SUM(count) OVER (), 1) as pct
+    FROM (
+        SELECT 
+            CASE WHEN archive_reason IS NULL OR archive_reason = '' 
+                 THEN 'Not Specified' 
+                 ELSE archive_reason 
+            END as reason,
+            COUNT(*) as count
+        FROM {_applications_source()}
+        WHERE current_stage_name = 'Archived'
+        AND (CAST(? AS VARCHAR) IS NULL OR department = ?)
+        GROUP BY reason
+        ORDER BY count DESC
+        LIMIT 15
+    )
+    ORDER BY count DESC
+    """
+    return (get_ro_conn().cursor().execute(rejection_query, [dept, dept])
+            .to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype))
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _load_votes(dept):
+    """Feedback vote counts across all candidates (no application_history)"""
+    rating_query = f"""
+    SELECT 
+        f.vote,
+        COUNT(*) as count
+    FROM feedback f
+    JOIN {_applications_source()} a ON f.application_id = a.id
+    WHERE f.vote IS NOT NULL
+    AND (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
+    GROUP BY f.vote
+    ORDER BY count DESC
+    """
+    return (get_ro_conn().cursor().execute(rating_query, [dept, dept])
+            .to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype))
+
+
+@st.cache_data(show_spinner=False)
+def _vote_pie(rating_df):
+    """Onsite vote pie, rebuilt only when the vote counts change"""
+    return px.pie(rating_df, values='count', names='vote', 
+                  title="Onsite Interview Votes",
+                  color_discrete_sequence=['#2ecc71', '#27ae60', '#e74c3c', '#c0392b'])
+
+
+@st.cache_data(show_spinner=False)
+def _source_conversion_fig(source_df):
+    """Onsite → Offer rate by source, rebuilt only when the data changes"""
+    fig = px.bar(
+        source_df,
+        x='source',
+        y='offer_rate',
+        color='offer_rate',
+        title="Onsite → Offer Rate by Source (candidates screened already)",
+        color_continuous_scale='Greens',
+        hover_data=['reached_onsite', 'got_offer']
+    )
+    fig.update_layout(yaxis_title="% Onsite → Offer")
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _source_hire_rate_fig(source_df):
+    """Fallback hire rate by source chart, rebuilt only when the data changes"""
+    return px.bar(
+        source_df,
+        x='source',
+        y='hire_rate',
+        color='hire_rate',
+        title="Hire Rate by Source (fallback)",
+        color_continuous_scale='Greens'
+    )
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _source_patterns(dept):
+    """Hire rate by source, used when application_history is missing"""
+    return science.get_source_patterns(dept)
+
+
+@st.fragment
+def render_screening_tab():
     st.header("🔍 Pre-Onsite Screening Analysis")
     st.markdown("""
     **Question:** What could we screen for earlier to increase onsite pass rates?
@@ -556,65 +811,25 @@ with tab2:
     """)
     
     # Department filter for this tab
-    screening_departments = ['All'] + science.get_departments()
-    selected_screening_dept = st.selectbox("Filter by Department:", screening_departments, key="screening_dept")
+    selected_screening_dept = st.selectbox("Filter by Department:", _departments(), key="screening_dept")
     screening_dept_filter = None if selected_screening_dept == 'All' else selected_screening_dept
     
     # Rejection Reasons Chart - Only for candidates who reached Onsite
     st.subheader("📊 Onsite Rejection Reasons")
     st.caption("Showing rejection reasons only for candidates who reached the Onsite stage")
     
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
-    
     # Check if we have application_history table
-    has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
+    has_history = _has_history()
     
     try:
-        dept_where = f"AND a.department = '{screening_dept_filter}'" if screening_dept_filter else ""
-        
         if has_history:
-            # Use application_history to find candidates who reached onsite
-            rejection_query = f"""
-            WITH onsite_candidates AS (
-                SELECT DISTINCT h.application_id
-                FROM application_history h
-                WHERE h.stage_name ILIKE '%onsite%' 
-                   OR h.stage_name = 'All Around'
-                   OR h.stage_name = 'Work Trial'
-            )
-            SELECT 
-                CASE WHEN a.archive_reason IS NULL OR a.archive_reason = '' 
-                     THEN 'Not Specified' 
-                     ELSE a.archive_reason 
-                END as reason,
-                COUNT(*) as count
-            FROM applications a
-            JOIN onsite_candidates oc ON a.id = oc.application_id
-            WHERE a.current_stage_name = 'Archived'
-            {dept_where}
-            GROUP BY reason
-            ORDER BY count DESC
-            LIMIT 15
-            """
+            # Onsite-filtered rejections, votes and sources come back together
+            rejection_df, rating_df, source_df = _load_onsite_bundle(screening_dept_filter)
         else:
             # Fallback: just show all archived
             st.warning("⚠️ Run history fetch for accurate onsite filtering")
-            rejection_query = f"""
-            SELECT 
-                CASE WHEN archive_reason IS NULL OR archive_reason = '' 
-                     THEN 'Not Specified' 
-                     ELSE archive_reason 
-                END as reason,
-                COUNT(*) as count
-            FROM applications
-            WHERE current_stage_name = 'Archived'
-            {dept_where.replace('a.', '')}
-            GROUP BY reason
-            ORDER BY count DESC
-            LIMIT 15
-            """
-        
-        rejection_df = conn.execute(rejection_query).df()
+            rejection_df = _load_archived_reasons(screening_dept_filter)
+            rating_df = _load_votes(screening_dept_filter)
         
         if len(rejection_df) > 0 and rejection_df['reason'].iloc[0] != 'Not Specified':
             col1, col2 = st.columns([2, 1])
@@ -622,30 +837,27 @@ with tab2:
             with col1:
                 dept_label = f" - {screening_dept_filter}" if screening_dept_filter else ""
                 title = f"Rejection Reasons at Onsite Stage{dept_label}"
-                fig = px.bar(
+                # Small static chart: the native Vega bar chart is a much lighter payload than Plotly
+                st.markdown(f"**{title}**")
+                st.bar_chart(
                     rejection_df,
-                    x='count',
-                    y='reason',
-                    orientation='h',
-                    title=title,
-                    color='count',
-                    color_continuous_scale='Reds'
+                    x='reason',
+                    y='count',
+                    horizontal=True,
+                    sort=False,
+                    color='#e74c3c',
+                    height=400
                 )
-                fig.update_layout(yaxis={'categoryorder': 'total ascending'}, height=400)
-                st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.markdown("**Top Onsite Rejection Reasons:**")
-                for _, row in rejection_df.head(8).iterrows():
-                    pct = row['count'] / rejection_df['count'].sum() * 100
-                    st.markdown(f"• **{row['reason']}**: {row['count']:,} ({pct:.1f}%)")
+                for row in rejection_df.head(8).itertuples(index=False):
+                    st.markdown(f"• **{row.reason}**: {row.count:,} ({row.pct:.1f}%)")
         else:
             st.warning("⚠️ Archive reasons not populated. Run `python update_applications.py` to fetch data.")
         
     except Exception as e:
         st.error(f"Error loading rejection reasons: {e}")
-    finally:
-        conn.close()
     
     st.markdown("---")
     
@@ -655,52 +867,8 @@ with tab2:
         st.subheader("📊 Onsite Vote Distribution")
         st.caption("Votes for candidates who reached Onsite stage")
         try:
-            conn = duckdb.connect(str(DB_PATH), read_only=True)
-            has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
-            
-            dept_filter_sql = f"AND a.department = '{screening_dept_filter}'" if screening_dept_filter else ""
-            
-            if has_history:
-                rating_query = f"""
-                WITH onsite_candidates AS (
-                    SELECT DISTINCT h.application_id
-                    FROM application_history h
-                    WHERE h.stage_name ILIKE '%onsite%' 
-                       OR h.stage_name = 'All Around'
-                       OR h.stage_name = 'Work Trial'
-                )
-                SELECT 
-                    f.vote,
-                    COUNT(*) as count
-                FROM feedback f
-                JOIN applications a ON f.application_id = a.id
-                JOIN onsite_candidates oc ON a.id = oc.application_id
-                WHERE f.vote IS NOT NULL
-                {dept_filter_sql}
-                GROUP BY f.vote
-                ORDER BY count DESC
-                """
-            else:
-                rating_query = f"""
-                SELECT 
-                    f.vote,
-                    COUNT(*) as count
-                FROM feedback f
-                JOIN applications a ON f.application_id = a.id
-                WHERE f.vote IS NOT NULL
-                {dept_filter_sql}
-                GROUP BY f.vote
-                ORDER BY count DESC
-                """
-            
-            rating_df = conn.execute(rating_query).df()
-            conn.close()
-            
             if len(rating_df) > 0:
-                fig = px.pie(rating_df, values='count', names='vote', 
-                            title="Onsite Interview Votes",
-                            color_discrete_sequence=['#2ecc71', '#27ae60', '#e74c3c', '#c0392b'])
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(_vote_pie(rating_df), use_container_width=True)
             else:
                 st.info("No vote data available")
                 
@@ -711,55 +879,9 @@ with tab2:
         st.subheader("📈 Onsite → Offer Conversion by Source")
         st.caption("Among candidates who reached Onsite, which sources convert to Offer best?")
         try:
-            conn = duckdb.connect(str(DB_PATH), read_only=True)
-            has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
-            
-            dept_filter_sql = f"AND a.department = '{screening_dept_filter}'" if screening_dept_filter else ""
-            
             if has_history:
-                # Find candidates who reached Onsite and whether they got Offer
-                source_query = f"""
-                WITH onsite_candidates AS (
-                    SELECT DISTINCT h.application_id
-                    FROM application_history h
-                    WHERE h.stage_name ILIKE '%onsite%' 
-                       OR h.stage_name = 'All Around'
-                       OR h.stage_name = 'Work Trial'
-                ),
-                offer_candidates AS (
-                    SELECT DISTINCT h.application_id
-                    FROM application_history h
-                    WHERE h.stage_name ILIKE '%offer%'
-                )
-                SELECT 
-                    a.source,
-                    COUNT(DISTINCT oc.application_id) as reached_onsite,
-                    COUNT(DISTINCT ofc.application_id) as got_offer,
-                    ROUND(COUNT(DISTINCT ofc.application_id) * 100.0 / NULLIF(COUNT(DISTINCT oc.application_id), 0), 1) as offer_rate
-                FROM applications a
-                JOIN onsite_candidates oc ON a.id = oc.application_id
-                LEFT JOIN offer_candidates ofc ON a.id = ofc.application_id
-                WHERE 1=1 {dept_filter_sql}
-                GROUP BY a.source
-                HAVING COUNT(DISTINCT oc.application_id) >= 5
-                ORDER BY offer_rate DESC
-                LIMIT 15
-                """
-                source_df = conn.execute(source_query).df()
-                conn.close()
-                
                 if len(source_df) > 0:
-                    fig = px.bar(
-                        source_df,
-                        x='source',
-                        y='offer_rate',
-                        color='offer_rate',
-                        title="Onsite → Offer Rate by Source (candidates screened already)",
-                        color_continuous_scale='Greens',
-                        hover_data=['reached_onsite', 'got_offer']
-                    )
-                    fig.update_layout(yaxis_title="% Onsite → Offer")
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(_source_conversion_fig(source_df), use_container_width=True)
                     
                     # Show the data table too
                     st.caption("Data breakdown:")
@@ -768,18 +890,10 @@ with tab2:
                     st.info("No source data available (need application_history)")
             else:
                 st.warning("Requires application_history table - run update_history.py first")
-                source_df = science.get_source_patterns(screening_dept_filter)
+                source_df = _source_patterns(screening_dept_filter)
                 
                 if len(source_df) > 0:
-                    fig = px.bar(
-                        source_df,
-                        x='source',
-                        y='hire_rate',
-                        color='hire_rate',
-                        title="Hire Rate by Source (fallback)",
-                        color_continuous_scale='Greens'
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(_source_hire_rate_fig(source_df), use_container_width=True)
                 
                 st.dataframe(source_df, use_container_width=True, hide_index=True)
         except Exception as e:
@@ -804,14 +918,18 @@ with tab2:
         with st.spinner("Analyzing feedback with OpenAI..."):
             try:
                 # Pass department filter and onsite_only flag
-                feedback_df = science.get_rejection_feedback(department=screening_dept_filter, onsite_only=True)
+                feedback_df = science.get_rejection_feedback_texts(department=screening_dept_filter, onsite_only=True)
                 
                 if len(feedback_df) > 0:
-                    st.caption(f"Analyzing {len(feedback_df)} onsite rejection feedback entries...")
-                    feedback_texts = feedback_df['feedback_text'].dropna().tolist()
-                    analysis = science.analyze_feedback_themes(feedback_texts, "pre_screening")
+                    st.caption(f"Analyzing {len(feedback_df)} distinct onsite rejection feedback entries...")
+                    feedback_texts = feedback_df['feedback_text'].tolist()
+                    try:
+                        analysis = _analyze_feedback_themes(feedback_texts, "pre_screening")
+                    except RuntimeError as e:
+                        analysis = None
+                        st.warning(str(e))
                     
-                    if not analysis.get('error'):
+                    if analysis:
                         st.success("Analysis complete!")
                         
                         col1, col2 = st.columns(2)
@@ -829,18 +947,36 @@ with tab2:
                         
                         st.markdown("**📝 Summary:**")
                         st.info(analysis.get('summary', 'No summary available'))
-                    else:
-                        st.warning(analysis.get('summary', 'Analysis failed'))
                 else:
                     st.info("No onsite rejection feedback available. Make sure application_history is populated.")
                     
             except Exception as e:
                 st.error(f"Error analyzing feedback: {e}")
 
+
+with tab2:
+    if tab2.open:
+        render_screening_tab()
+
 # =============================================================================
 # TAB 3: FALSE NEGATIVE DETECTIVE
 # =============================================================================
-with tab3:
+FN_DISPLAY_COLUMNS = {
+    'false_negatives': ['candidate_name', 'department', 'avg_rating', 'hire_votes', 'no_hire_votes', 'archive_reason'],
+    'dissenting_votes': ['candidate_name', 'department', 'yes_votes', 'no_votes', 'current_stage_name', 'archive_reason'],
+    'close_calls': ['candidate_name', 'department', 'avg_rating', 'min_rating', 'max_rating', 'current_stage_name', 'archive_reason'],
+    'rehires': ['candidate_name', 'department', 'current_stage_name', 'archive_reason', 'total_applications'],
+}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _false_negative_bundle(dept, rating_threshold):
+    """All False Negatives results for one department/threshold, from one connection"""
+    return science.get_false_negative_bundle(dept, rating_threshold, columns=FN_DISPLAY_COLUMNS)
+
+
+@st.fragment
+def render_false_negatives_tab():
     st.header("❓ False Negative Detective")
     st.markdown("""
     **Question:** Are we rejecting good candidates? 
@@ -849,8 +985,7 @@ with tab3:
     """)
     
     # Department filter
-    fn_departments = ['All'] + science.get_departments()
-    selected_fn_dept = st.selectbox("Filter by Department:", fn_departments, key="fn_dept")
+    selected_fn_dept = st.selectbox("Filter by Department:", _departments(), key="fn_dept")
     fn_dept_filter = None if selected_fn_dept == 'All' else selected_fn_dept
     
     # Controls
@@ -861,18 +996,23 @@ with tab3:
                                     help="1=Strong No, 2=No, 3=Yes, 4=Strong Yes")
     
     try:
-        false_negatives = science.detect_false_negatives(rating_threshold, department=fn_dept_filter)
+        fn_results = _false_negative_bundle(fn_dept_filter, rating_threshold)
+    except Exception as e:
+        st.error(f"Error detecting false negatives: {e}")
+        import traceback
+        st.code(traceback.format_exc())
+        return
+    
+    try:
+        false_negatives = fn_results.false_negatives
         
         if len(false_negatives) > 0:
             st.success(f"Found **{len(false_negatives)}** potential false negatives to review")
             st.caption("These candidates were archived but had positive ratings from some interviewers")
             
             # Display as table
-            display_cols = ['candidate_name', 'department', 'avg_rating', 'hire_votes', 'no_hire_votes', 'archive_reason']
-            available_cols = [c for c in display_cols if c in false_negatives.columns]
-            
             st.dataframe(
-                false_negatives[available_cols],
+                false_negatives,
                 use_container_width=True,
                 hide_index=True,
                 column_config={
@@ -887,7 +1027,7 @@ with tab3:
             st.markdown("---")
             st.subheader("📊 Rejection Patterns")
             
-            rejection_chars = science.get_rejection_characteristics()
+            rejection_chars = fn_results.rejection_characteristics
             
             if len(rejection_chars) > 0:
                 # By department
@@ -922,12 +1062,10 @@ with tab3:
     with fn_tab1:
         st.markdown("**Candidates where interviewers disagreed** (some Yes, some No)")
         try:
-            dissenting = science.get_dissenting_votes(fn_dept_filter)
+            dissenting = fn_results.dissenting_votes
             if len(dissenting) > 0:
                 st.info(f"Found **{len(dissenting)}** candidates with split decisions")
-                display_cols = ['candidate_name', 'department', 'yes_votes', 'no_votes', 'current_stage_name', 'archive_reason']
-                available = [c for c in display_cols if c in dissenting.columns]
-                st.dataframe(dissenting[available], use_container_width=True, hide_index=True)
+                st.dataframe(dissenting, use_container_width=True, hide_index=True)
             else:
                 st.info("No split decisions found")
         except Exception as e:
@@ -936,12 +1074,10 @@ with tab3:
     with fn_tab2:
         st.markdown("**Borderline candidates** (avg rating 2.5-3.5 on 1-4 scale)")
         try:
-            close_calls = science.get_close_call_decisions(fn_dept_filter)
+            close_calls = fn_results.close_calls
             if len(close_calls) > 0:
                 st.info(f"Found **{len(close_calls)}** close-call decisions")
-                display_cols = ['candidate_name', 'department', 'avg_rating', 'min_rating', 'max_rating', 'current_stage_name', 'archive_reason']
-                available = [c for c in display_cols if c in close_calls.columns]
-                st.dataframe(close_calls[available], use_container_width=True, hide_index=True,
+                st.dataframe(close_calls, use_container_width=True, hide_index=True,
                             column_config={'avg_rating': st.column_config.NumberColumn("Avg Rating", format="%.2f")})
             else:
                 st.info("No close-call decisions found")
@@ -951,13 +1087,11 @@ with tab3:
     with fn_tab3:
         st.markdown("**Candidates who applied multiple times** - were they eventually hired?")
         try:
-            rehires = science.get_rehire_patterns(fn_dept_filter)
+            rehires = fn_results.rehires
             if len(rehires) > 0:
-                unique_candidates = rehires['candidate_id'].nunique() if 'candidate_id' in rehires.columns else 0
+                unique_candidates = rehires['unique_candidates'].iloc[0]
                 st.info(f"Found **{unique_candidates}** candidates with multiple applications")
-                display_cols = ['candidate_name', 'department', 'current_stage_name', 'archive_reason', 'total_applications']
-                available = [c for c in display_cols if c in rehires.columns]
-                st.dataframe(rehires[available], use_container_width=True, hide_index=True)
+                st.dataframe(rehires[FN_DISPLAY_COLUMNS['rehires']], use_container_width=True, hide_index=True)
             else:
                 st.info("No repeat applicants found")
         except Exception as e:
@@ -966,11 +1100,8 @@ with tab3:
     with fn_tab4:
         st.markdown("**Archive reasons that suggest good candidates we lost**")
         try:
-            archive_reasons = science.get_archive_reason_analysis(fn_dept_filter)
+            archive_reasons, signal_counts = fn_results.archive_reasons, fn_results.archive_signals
             if len(archive_reasons) > 0:
-                # Highlight specific reasons
-                good_signals = ['Future Candidate', 'Accepted Other Offer', 'Timing', 'Withdrew']
-                
                 col1, col2 = st.columns(2)
                 with col1:
                     st.markdown("**All Archive Reasons:**")
@@ -979,10 +1110,9 @@ with tab3:
                 
                 with col2:
                     st.markdown("**🚨 Signals of Lost Good Candidates:**")
-                    for reason in good_signals:
-                        match = archive_reasons[archive_reasons['archive_reason'].str.contains(reason, case=False, na=False)]
-                        if len(match) > 0:
-                            count = match['count'].sum()
+                    # Highlight specific reasons
+                    for reason, count in signal_counts.items():
+                        if count > 0:
                             st.metric(reason, f"{count} candidates")
             else:
                 st.info("No archive reason data")
@@ -994,10 +1124,16 @@ with tab3:
     **❌ Not Available:** External Validation (where rejected candidates ended up) - would require LinkedIn/external data integration.
     """)
 
+
+with tab3:
+    if tab3.open:
+        render_false_negatives_tab()
+
 # =============================================================================
 # TAB 4: INTERVIEWER CALIBRATION
 # =============================================================================
-with tab4:
+@st.fragment
+def render_calibration_tab():
     st.header("⚖️ Interviewer Calibration Leaderboard")
     st.markdown("""
     **Question:** Do we have uncalibrated interviewers? Hawks who always say no? Doves who always say yes?
@@ -1005,8 +1141,7 @@ with tab4:
     st.caption("📊 **Key stages only** - includes feedback from Coding 1, Hiring Manager Screen, Technical Interview 1, Technical Interview 2, and Onsite")
     
     # Department filter
-    cal_departments = ['All'] + science.get_departments()
-    selected_cal_dept = st.selectbox("Filter by Department:", cal_departments, key="cal_dept")
+    selected_cal_dept = st.selectbox("Filter by Department:", _departments(), key="cal_dept")
     cal_dept_filter = None if selected_cal_dept == 'All' else selected_cal_dept
     
     try:
@@ -1014,9 +1149,10 @@ with tab4:
         
         if len(calibration_df) > 0:
             # Summary metrics
-            hawks = len(calibration_df[calibration_df['calibration'].str.contains('Hawk')])
-            doves = len(calibration_df[calibration_df['calibration'].str.contains('Dove')])
-            calibrated = len(calibration_df[calibration_df['calibration'].str.contains('Calibrated')])
+            code_counts = calibration_df['calibration_code'].value_counts()
+            hawks = int(code_counts.get(science.CALIBRATION_HAWK, 0))
+            doves = int(code_counts.get(science.CALIBRATION_DOVE, 0))
+            calibrated = int(code_counts.get(science.CALIBRATION_CALIBRATED, 0))
             
             col1, col2, col3 = st.columns(3)
             col1.metric("🦅 Hawks (Strict)", hawks)
@@ -1061,10 +1197,16 @@ with tab4:
     except Exception as e:
         st.error(f"Error calculating calibration: {e}")
 
+
+with tab4:
+    if tab4.open:
+        render_calibration_tab()
+
 # =============================================================================
 # TAB 5: FALSE POSITIVES
 # =============================================================================
-with tab5:
+@st.fragment
+def render_false_positives_tab():
     st.header("⚠️ False Positive Analysis")
     st.markdown("""
     **Question:** Are there people who passed our interviews but left the company quickly?
@@ -1073,8 +1215,7 @@ with tab5:
     """)
     
     # Department filter
-    fp_departments = ['All'] + science.get_departments()
-    selected_fp_dept = st.selectbox("Filter by Department:", fp_departments, key="fp_dept")
+    selected_fp_dept = st.selectbox("Filter by Department:", _departments(), key="fp_dept")
     fp_dept_filter = None if selected_fp_dept == 'All' else selected_fp_dept
     
     try:
@@ -1112,9 +1253,13 @@ with tab5:
                         
                         if len(fp_feedback) > 0:
                             feedback_texts = fp_feedback['feedback_text'].dropna().tolist()
-                            analysis = science.analyze_feedback_themes(feedback_texts, "general")
+                            try:
+                                analysis = _analyze_feedback_themes(feedback_texts, "general")
+                            except RuntimeError as e:
+                                analysis = None
+                                st.warning(str(e))
                             
-                            if not analysis.get('error'):
+                            if analysis:
                                 st.markdown("**🎯 Common Themes in Feedback:**")
                                 for theme in analysis.get('themes', []):
                                     st.markdown(f"• {theme}")
@@ -1132,6 +1277,11 @@ with tab5:
     except Exception as e:
         st.error(f"Error analyzing false positives: {e}")
 
+
+with tab5:
+    if tab5.open:
+        render_false_positives_tab()
+
 # =============================================================================
 # TAB 6: RECOMMENDATIONS
 # =============================================================================
@@ -1140,41 +1290,14 @@ with tab5:
 # =============================================================================
 # TAB 7: SQL QUERY
 # =============================================================================
-with tab7:
-    st.header("🔎 SQL Query Tool")
-    st.markdown("Run custom SQL queries against the interview data for validation and exploration.")
-    
-    # Schema explorer in sidebar
-    with st.sidebar:
-        st.header("📊 Schema Explorer")
-        
-        conn = duckdb.connect(str(DB_PATH), read_only=True)
-        tables = conn.execute("SHOW TABLES").df()['name'].tolist()
-        
-        selected_table = st.selectbox("Select Table:", [""] + tables)
-        
-        if selected_table:
-            st.markdown(f"**Table: `{selected_table}`**")
-            
-            # Get columns
-            sample = conn.execute(f"SELECT * FROM {selected_table} LIMIT 1").df()
-            
-            st.markdown("**Columns:**")
-            for col in sample.columns:
-                dtype = str(sample[col].dtype)
-                st.code(f"{col} ({dtype})", language=None)
-            
-            # Row count
-            count = conn.execute(f"SELECT COUNT(*) FROM {selected_table}").fetchone()[0]
-            st.markdown(f"**Rows:** {count:,}")
-        
-        conn.close()
-        
-        st.markdown("---")
-        st.markdown("### 💡 Example Queries")
-        
-        example_queries = {
-            "Funnel by Department": """
+# Rows shown in the results grid; the CSV download always has the full result
+QUERY_PREVIEW_ROWS = 10_000
+# Rows sent to the browser at once; larger previews are paged
+QUERY_PAGE_ROWS = 1_000
+
+# Sidebar example queries, stripped once at import
+EXAMPLE_QUERIES = {name: query.strip() for name, query in {
+    "Funnel by Department": """
 SELECT 
     department,
     current_stage_name,
@@ -1182,28 +1305,28 @@ SELECT
 FROM applications
 GROUP BY department, current_stage_name
 ORDER BY department, count DESC
-            """,
-            "Interviewer Stats": """
+    """,
+    "Interviewer Stats": """
 SELECT 
     interviewer_name,
     COUNT(*) as interviews,
     AVG(overall_rating) as avg_rating,
-    SUM(CASE WHEN vote LIKE '%Hire%' AND vote NOT LIKE '%No%' THEN 1 ELSE 0 END) as hire_votes
+    COUNT(*) FILTER (WHERE vote LIKE '%Hire%' AND vote NOT LIKE '%No%') as hire_votes
 FROM feedback
 GROUP BY interviewer_name
 ORDER BY interviews DESC
-            """,
-            "Source Performance": """
+    """,
+    "Source Performance": """
 SELECT 
     source,
     COUNT(*) as total,
-    SUM(CASE WHEN status = 'Hired' THEN 1 ELSE 0 END) as hired,
-    ROUND(SUM(CASE WHEN status = 'Hired' THEN 1.0 ELSE 0 END) / COUNT(*) * 100, 1) as hire_rate_pct
+    COUNT(*) FILTER (WHERE status = 'Hired') as hired,
+    ROUND(COUNT(*) FILTER (WHERE status = 'Hired') * 100.0 / COUNT(*), 1) as hire_rate_pct
 FROM applications
 GROUP BY source
 ORDER BY hire_rate_pct DESC
-            """,
-            "Rejection Reasons": """
+    """,
+    "Rejection Reasons": """
 SELECT 
     archive_reason,
     department,
@@ -1212,23 +1335,200 @@ FROM applications
 WHERE archived = true
 GROUP BY archive_reason, department
 ORDER BY count DESC
-            """
-        }
+    """
+}.items()}
+
+# Statement types the SQL tool will run; anything else is rejected before planning
+ALLOWED_STATEMENTS = {duckdb.StatementType.SELECT, duckdb.StatementType.EXPLAIN}
+
+# Errors decided by the query text and the catalog, so they are remembered per query
+# until the cached catalog changes; anything else (a table not loaded yet, out of memory,
+# interrupts) is retried on the next run
+PLANNER_ERRORS = (duckdb.ParserException, duckdb.BinderException)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _list_tables() -> list:
+    """Table names for the schema explorer"""
+    return get_ro_conn().cursor().execute("SHOW TABLES").df()['name'].tolist()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _catalog_columns() -> dict:
+    """(column, DuckDB type) pairs for every table, in one catalog query"""
+    columns = {}
+    for table, name, dtype in get_ro_conn().cursor().execute("""
+        SELECT table_name, column_name, data_type
+        FROM duckdb_columns()
+        WHERE database_name = current_database() AND schema_name = 'main'
+        ORDER BY table_name, column_index
+    """).fetchall():
+        columns.setdefault(table, []).append((name, dtype))
+    return columns
+
+
+def _table_columns(table: str) -> list:
+    """(column, DuckDB type) pairs for a table"""
+    return _catalog_columns().get(table, [])
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _table_size_estimates() -> dict:
+    """Row counts for every table from DuckDB's catalog statistics, without scanning"""
+    return dict(get_ro_conn().cursor().execute(
+        "SELECT table_name, estimated_size FROM duckdb_tables() WHERE NOT temporary"
+    ).fetchall())
+
+
+def _as_subquery(query: str) -> str:
+    """
+    A query wrapped as a SELECT the other statements can embed. The closing paren
+    goes on its own line so a trailing -- comment can't swallow it, and the SELECT *
+    lets SHOW / DESCRIBE / SUMMARIZE sit where only a SELECT is accepted (COPY).
+    """
+    return f"SELECT * FROM ({query.strip().rstrip(';')}\n) AS _"
+
+
+def _query_csv(conn, query: str) -> bytes:
+    """Write a query's full result to CSV with DuckDB's COPY and return the file bytes"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = Path(tmp_dir) / 'query_results.csv'
+        conn.cursor().execute(f"COPY ({_as_subquery(query)}) TO '{csv_path}' (HEADER, FORMAT CSV)")
+        return csv_path.read_bytes()
+
+
+def _query_rejection(query: str):
+    """Reason the SQL tool won't run a query, or None if it is a single read statement"""
+    statements = duckdb.extract_statements(query)
+    if len(statements) != 1:
+        return "Run one statement at a time."
+    if statements[0].type not in ALLOWED_STATEMENTS:
+        return f"Only read queries are allowed here, not {statements[0].type.name}."
+    return None
+
+
+def _unwrapped_error(conn, query: str, error: Exception) -> Exception:
+    """
+    The error for a query as typed rather than inside _as_subquery, so the message
+    quotes the user's statement. Relations are planned, not run, so this is cheap.
+    """
+    try:
+        conn.sql(query)
+    except duckdb.Error as e:
+        return e
+    return error
+
+
+def _query_preview(conn, query: str) -> tuple:
+    """
+    First QUERY_PREVIEW_ROWS + 1 rows of a query, so callers can tell it was capped,
+    and whether the query could run as a subquery (the CSV and summary need that)
+    """
+    try:
+        return conn.execute(f"{_as_subquery(query)} LIMIT {QUERY_PREVIEW_ROWS + 1}").to_arrow_table(), True
+    except duckdb.ParserException as e:
+        # PRAGMA and EXPLAIN can't be a subquery, so they run as typed; anything else
+        # failing to parse is a real syntax error
+        statement = duckdb.extract_statements(query)[0]
+        if statement.type != duckdb.StatementType.EXPLAIN and not query.lstrip().upper().startswith('PRAGMA'):
+            raise _unwrapped_error(conn, query, e) from None
+    except (duckdb.BinderException, duckdb.CatalogException) as e:
+        raise _unwrapped_error(conn, query, e) from None
+    
+    # Stream batches so the cap still holds without the LIMIT
+    reader = conn.execute(query).to_arrow_reader(QUERY_PREVIEW_ROWS + 1)
+    batches, rows = [], 0
+    while rows <= QUERY_PREVIEW_ROWS:
+        try:
+            batch = reader.read_next_batch()
+        except StopIteration:
+            break
+        batches.append(batch)
+        rows += batch.num_rows
+    return pa.Table.from_batches(batches, schema=reader.schema), False
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _query_summary(query: str) -> pd.DataFrame:
+    """Per-column min/max/avg/quantiles of a query's full result via SUMMARIZE"""
+    return get_ro_conn().cursor().execute(f"SUMMARIZE ({_as_subquery(query)})").df()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _query_describe(query: str, numeric_cols: tuple) -> pd.DataFrame:
+    """Exact describe() of a query's numeric columns, fetched as numpy arrays"""
+    select_list = ", ".join('"' + col.replace('"', '""') + '"' for col in numeric_cols)
+    arrays = get_ro_conn().cursor().execute(
+        f"SELECT {select_list} FROM ({_as_subquery(query)})"
+    ).fetchnumpy()
+    return pd.DataFrame(arrays).describe()
+
+
+def _load_example_query():
+    """Copy the chosen example into the query editor"""
+    name = st.session_state.get('example_query')
+    if name:
+        st.session_state['sql_query'] = EXAMPLE_QUERIES[name]
+
+
+def _table_rowcount(table: str) -> int:
+    """Row count for a table: the catalog estimate, or COUNT(*) when there is none"""
+    count = _table_size_estimates().get(table)
+    if count is None:
+        count = get_ro_conn().cursor().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return count
+
+
+with tab7:
+    st.header("🔎 SQL Query Tool")
+    st.markdown("Run custom SQL queries against the interview data for validation and exploration.")
+    
+    # Schema explorer in sidebar
+    with st.sidebar:
+        st.header("📊 Schema Explorer")
+        
+        tables = _list_tables()
+        
+        selected_table = st.selectbox("Select Table:", [""] + tables)
         
-        for name, query in example_queries.items():
-            if st.button(f"📌 {name}", key=f"example_{name}"):
-                st.session_state['sql_query'] = query.strip()
+        if selected_table:
+            st.markdown(f"**Table: `{selected_table}`**")
+            
+            # Get columns
+            st.markdown("**Columns:**")
+            columns = _table_columns(selected_table)
+            st.dataframe(
+                pd.DataFrame(columns, columns=['column', 'type']),
+                hide_index=True,
+                use_container_width=True,
+                height=min(35 * len(columns) + 38, 400),
+            )
+            
+            # Row count
+            st.markdown(f"**Rows:** {_table_rowcount(selected_table):,}")
+        
+        st.markdown("---")
+        st.markdown("### 💡 Example Queries")
+        
+        st.selectbox(
+            "Load an example:",
+            list(EXAMPLE_QUERIES),
+            index=None,
+            placeholder="📌 Choose an example query",
+            key='example_query',
+            on_change=_load_example_query,
+        )
     
     # Main query interface
     col1, col2 = st.columns([2, 1])
     
     with col1:
-        default_query = st.session_state.get('sql_query', 'SELECT * FROM applications LIMIT 10')
+        st.session_state.setdefault('sql_query', 'SELECT * FROM applications LIMIT 10')
         
         query = st.text_area(
             "Enter SQL Query:",
-            value=default_query,
-            height=200
+            height=200,
+            key='sql_query'
         )
         
         col_btn1, col_btn2 = st.columns(2)
@@ -1237,60 +1537,101 @@ ORDER BY count DESC
             run_query = st.button("▶️ Run Query", type="primary", use_container_width=True)
         
         with col_btn2:
-            if st.button("🗑️ Clear", use_container_width=True):
-                st.session_state['sql_query'] = ''
-                st.rerun()
+            st.button("🗑️ Clear", use_container_width=True,
+                      on_click=lambda: st.session_state.update(sql_query=''))
     
     with col2:
         st.markdown("### 📋 Available Tables")
-        conn = duckdb.connect(str(DB_PATH), read_only=True)
         
+        # Only an opened expander queries its table, same as the lazy tabs
         for table in tables:
-            with st.expander(f"📋 {table}"):
-                try:
-                    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
-                    st.markdown(f"**Rows:** {count:,}")
-                    
-                    sample = conn.execute(f"SELECT * FROM {table} LIMIT 0").df()
-                    st.markdown("**Columns:**")
-                    for col in sample.columns:
-                        st.text(f"  • {col}")
-                except Exception as e:
-                    st.error(str(e))
-        
-        conn.close()
+            expander = st.expander(f"📋 {table}", key=f"table_expander_{table}", on_change="rerun")
+            with expander:
+                if expander.open:
+                    try:
+                        st.markdown(f"**Rows:** {_table_rowcount(table):,}")
+                        
+                        st.markdown("**Columns:**")
+                        st.markdown("\n".join(f"- {col}" for col, _ in _table_columns(table)))
+                    except Exception as e:
+                        st.error(str(e))
     
-    # Execute query
+    # Execute query; the result is kept in session state so later reruns
+    # (opening an expander, sorting the grid) redisplay it without re-running
     if run_query and query:
+        st.session_state.pop('sql_result', None)
+        error_query, query_error, error_catalog = st.session_state.get('sql_error', (None, None, None))
         try:
-            conn = duckdb.connect(str(DB_PATH), read_only=True)
-            
-            with st.spinner("Executing query..."):
-                result_df = conn.execute(query).df()
-            
-            conn.close()
-            
-            st.success(f"✅ Query returned {len(result_df)} rows")
-            
-            # Download button
-            csv = result_df.to_csv(index=False)
-            st.download_button(
-                "📥 Download as CSV",
-                csv,
-                "query_results.csv",
-                "text/csv"
-            )
-            
-            # Display results
-            st.dataframe(result_df, use_container_width=True, height=400)
-            
-            # Summary stats for numeric columns
-            numeric_cols = result_df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
-                with st.expander("📈 Summary Statistics"):
-                    st.dataframe(result_df[numeric_cols].describe())
+            rejection = _query_rejection(query)
+            if rejection:
+                st.error(f"❌ {rejection}")
+            elif error_query == query and error_catalog == _catalog_columns():
+                # Same text against the same tables, same planner error; don't send it back to DuckDB
+                raise duckdb.Error(query_error)
+            else:
+                conn = get_ro_conn().cursor()
+                
+                with st.spinner("Executing query..."):
+                    # Arrow straight to st.dataframe; no pandas round trip for the preview
+                    st.session_state['sql_result'] = (query, *_query_preview(conn, query))
+                    st.session_state['sql_result_page'] = 1
                     
         except Exception as e:
+            if isinstance(e, PLANNER_ERRORS):
+                st.session_state['sql_error'] = (query, str(e), _catalog_columns())
             st.error(f"❌ Query Error: {str(e)}")
             st.info("💡 Check the Schema Explorer in the sidebar for available tables and columns.")
-
+    
+    result_query, result_tbl, as_subquery = st.session_state.get('sql_result', (None, None, False))
+    if result_tbl is not None and result_query == query:
+        if result_tbl.num_rows > QUERY_PREVIEW_ROWS:
+            result_tbl = result_tbl.slice(0, QUERY_PREVIEW_ROWS)
+            st.warning(f"⚠️ Showing the first {QUERY_PREVIEW_ROWS:,} rows. "
+                       "Download the CSV for the full result.")
+        else:
+            st.success(f"✅ Query returned {result_tbl.num_rows} rows")
+        
+        # Download button: the CSV is written by DuckDB only when clicked; PRAGMA /
+        # EXPLAIN can't be COPY'd, so their (small) stored result is written instead
+        if as_subquery:
+            ro_conn = get_ro_conn()
+            csv_data = lambda: _query_csv(ro_conn, query)
+        else:
+            csv_data = lambda: result_tbl.to_pandas().to_csv(index=False)
+        st.download_button(
+            "📥 Download full results as CSV",
+            csv_data,
+            "query_results.csv",
+            "text/csv"
+        )
+        
+        # Display results a page at a time; paging re-slices the stored table, no re-query
+        if result_tbl.num_rows > QUERY_PAGE_ROWS:
+            n_pages = -(-result_tbl.num_rows // QUERY_PAGE_ROWS)
+            page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages,
+                                   key='sql_result_page')
+            st.dataframe(result_tbl.slice((page - 1) * QUERY_PAGE_ROWS, QUERY_PAGE_ROWS),
+                         use_container_width=True, height=400)
+        else:
+            st.dataframe(result_tbl, use_container_width=True, height=400)
+        
+        # Summary stats from DuckDB's SUMMARIZE, computed only once the expander is opened;
+        # PRAGMA / EXPLAIN results can't be summarized as a subquery, so they get none
+        if as_subquery:
+            stats_expander = st.expander("📈 Summary Statistics", key="sql_summary_expander", on_change="rerun")
+            with stats_expander:
+                if stats_expander.open:
+                    numeric_cols = tuple(
+                        field.name for field in result_tbl.schema
+                        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                        or pa.types.is_decimal(field.type)
+                    )
+                    exact = st.toggle("Exact quantiles (numeric columns)", key="sql_summary_exact",
+                                      disabled=not numeric_cols)
+                    try:
+                        if exact and numeric_cols:
+                            st.dataframe(_query_describe(query, numeric_cols), use_container_width=True)
+                        else:
+                            st.dataframe(_query_summary(query), use_container_width=True)
+                    except Exception as e:
+                        st.error(str(e))
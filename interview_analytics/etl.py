@@ -5,9 +5,14 @@ Fetches data from Ashby API and stores in DuckDB for SQL querying.
 import duckdb
 import pandas as pd
 import numpy as np
+import orjson
+import pyarrow as pa
 import os
-import requests
+import httpx
 import base64
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -20,6 +25,33 @@ SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / 'data'
 DATA_DIR.mkdir(exist_ok=True)
 DB_PATH = DATA_DIR / 'interview_analytics.duckdb'
+# Dashboard-side copy of the applications columns it filters on (see export_parquet)
+APPLICATIONS_PARQUET = DATA_DIR / 'applications.parquet'
+
+# Settings for the ETL's write connection: every core for the bulk CREATE TABLE AS loads,
+# with a memory cap that spills to the system temp dir (as science.DB_CONFIG does) instead
+# of growing RSS
+LOAD_DB_CONFIG = {
+    'threads': os.cpu_count() or 4,
+    'memory_limit': '4GB',
+    'temp_directory': str(Path(tempfile.gettempdir()) / 'duckdb_spill'),
+}
+
+# Concurrent per-entity calls (application.listHistory per application, interviewStage.list
+# per plan); multiplexed as HTTP/2 streams on the client
+FANOUT_WORKERS = 16
+
+# Raw results of slow-changing list endpoints plus the syncToken to resume them from.
+# Deltas only add or update records, so the cache is rebuilt from a full fetch once it
+# is API_CACHE_MAX_AGE_DAYS old to drop records deleted upstream.
+API_CACHE_DIR = DATA_DIR / 'api_cache'
+API_CACHE_MAX_AGE_DAYS = 7
+
+# Transient API responses retried with exponential backoff (0.5s, 1s, 2s, ...),
+# or after the server's Retry-After when it sends one
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.5
 
 
 class AshbyAPI:
@@ -30,35 +62,61 @@ class AshbyAPI:
         self.base_url = "https://api.ashbyhq.com"
         self.headers = {
             "Authorization": f"Basic {base64.b64encode(f'{api_key}:'.encode()).decode()}",
-            "Content-Type": "application/json"
+            "Content-Type": "application/json",
+            # Explicit, though httpx already asks for and decodes gzip by default
+            "Accept-Encoding": "gzip"
         }
+        # One HTTP/2 client for every call: concurrent requests share a single TLS
+        # connection as multiplexed streams. The transport retries failed connects.
+        self.client = httpx.Client(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=30.0,
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=MAX_RETRIES,
+                limits=httpx.Limits(max_connections=8, max_keepalive_connections=8),
+            ),
+        )
+    
+    def close(self):
+        """Close the client's HTTP connections."""
+        self.client.close()
     
     def _post(self, endpoint: str, data: dict = None) -> dict:
         """Make POST request to Ashby API."""
         if data is None:
             data = {}
         
-        url = f"{self.base_url}/{endpoint}"
-        response = requests.post(url, headers=self.headers, json=data)
+        # Every endpoint we call is a read, so retrying a POST is safe
+        for attempt in range(MAX_RETRIES + 1):
+            response = self.client.post(f"/{endpoint}", json=data)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            retry_after = response.headers.get('Retry-After', '')
+            time.sleep(int(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt)
         
         if response.status_code != 200:
             print(f"❌ API request failed: {endpoint} - Status {response.status_code}")
             print(f"   Response: {response.text[:500]}")
             return None
         
-        result = response.json()
+        result = orjson.loads(response.content)
         if not result.get('success', False):
             print(f"❌ API error on {endpoint}: {result}")
             return None
         
         return result
     
-    def _fetch_all_paginated(self, endpoint: str, data: dict = None) -> list:
-        """Fetch all pages from a paginated endpoint."""
+    def _iter_pages(self, endpoint: str, data: dict = None, sync: dict = None):
+        """
+        Yield each page of results from a paginated endpoint as it arrives.
+        If `sync` is given, it gets 'complete' once the last page has been read
+        and the 'sync_token' Ashby returns for fetching later changes.
+        """
         if data is None:
             data = {}
         
-        all_results = []
         cursor = None
         page = 1
         
@@ -72,21 +130,69 @@ class AshbyAPI:
                 break
             
             results = result.get('results', [])
-            all_results.extend(results)
+            yield results
+            
+            if sync is not None:
+                sync['sync_token'] = result.get('syncToken')
             
             # Check for next page
             next_cursor = result.get('nextCursor') or result.get('moreDataAvailable')
-            if not next_cursor or not results:
-                break
-            
             cursor = result.get('nextCursor')
-            if not cursor:
+            if not next_cursor or not results or not cursor:
+                if sync is not None:
+                    sync['complete'] = True
                 break
                 
             page += 1
             print(f"   Fetching page {page}...")
+    
+    def _fetch_all_paginated(self, endpoint: str, data: dict = None, sync: dict = None) -> list:
+        """Fetch all pages from a paginated endpoint."""
+        return [record for results in self._iter_pages(endpoint, data, sync) for record in results]
+    
+    def _fetch_cached(self, endpoint: str) -> list:
+        """
+        Fetch a paginated endpoint incrementally.
+        The full result and Ashby's syncToken from the last run are kept in API_CACHE_DIR;
+        later runs only download the records changed since then and merge them by id.
+        A full fetch (no usable token, or a cache past API_CACHE_MAX_AGE_DAYS) replaces
+        the cache outright.
+        """
+        cache_path = API_CACHE_DIR / f'{endpoint}.json'
+        cached = orjson.loads(cache_path.read_bytes()) if cache_path.exists() else {}
+        full_sync_at = cached.get('full_sync_at')
+        cache_fresh = bool(full_sync_at) and \
+            datetime.now() - datetime.fromisoformat(full_sync_at) < timedelta(days=API_CACHE_MAX_AGE_DAYS)
         
-        return all_results
+        sync = {}
+        if cached.get('sync_token') and cache_fresh:
+            changed = self._fetch_all_paginated(endpoint, {'syncToken': cached['sync_token']}, sync)
+            if sync.get('complete'):
+                print(f"   {len(changed)} changed since last sync")
+                records = {record.get('id'): record for record in cached['results']}
+                records.update((record.get('id'), record) for record in changed)
+                results = list(records.values())
+            else:
+                # Expired or rejected token: start over with a full fetch
+                sync = {}
+        
+        if not sync.get('complete'):
+            # Full fetch: the cached records are discarded, not merged
+            results = self._fetch_all_paginated(endpoint, sync=sync)
+            full_sync_at = datetime.now().isoformat()
+        
+        # Only a fully read result is safe to resume from
+        if sync.get('complete') and sync.get('sync_token'):
+            API_CACHE_DIR.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_suffix('.tmp')
+            tmp_path.write_bytes(orjson.dumps({
+                'sync_token': sync['sync_token'],
+                'full_sync_at': full_sync_at,
+                'results': results
+            }))
+            tmp_path.replace(cache_path)
+        
+        return results
     
     def get_applications(self) -> list:
         """Fetch all applications."""
@@ -98,6 +204,14 @@ class AshbyAPI:
         print("📥 Fetching application feedback...")
         return self._fetch_all_paginated('applicationFeedback.list')
     
+    def iter_application_feedback_pages(self, sync: dict = None):
+        """
+        Fetch application feedback one page at a time, for streaming loads.
+        Pass `sync` to learn whether the last page was reached (see _iter_pages).
+        """
+        print("📥 Fetching application feedback...")
+        return self._iter_pages('applicationFeedback.list', sync=sync)
+    
     def get_interviews(self) -> list:
         """Fetch all interviews."""
         print("📥 Fetching interviews...")
@@ -125,24 +239,27 @@ class AshbyAPI:
         
         print(f"   Found {len(plans)} interview plans")
         
-        # Fetch stages for each plan
+        # Fetch stages for all plans concurrently; map() keeps plan order, so a stage
+        # shared by several plans is still attributed to the first one
+        plans = [plan for plan in plans if plan.get('id')]
+        
+        def fetch(plan):
+            return self._post('interviewStage.list', {'interviewPlanId': plan['id']})
+        
+        with ThreadPoolExecutor(max_workers=FANOUT_WORKERS) as executor:
+            results = list(executor.map(fetch, plans))
+        
         all_stages = []
         seen_stage_ids = set()  # Deduplicate stages that appear in multiple plans
         
-        for plan in plans:
-            plan_id = plan.get('id')
-            if not plan_id:
-                continue
-            
-            result = self._post('interviewStage.list', {'interviewPlanId': plan_id})
-            
+        for plan, result in zip(plans, results):
             if result:
                 stages = result.get('results', [])
                 for stage in stages:
                     stage_id = stage.get('id')
                     if stage_id and stage_id not in seen_stage_ids:
                         # Add plan info to stage
-                        stage['interviewPlanId'] = plan_id
+                        stage['interviewPlanId'] = plan['id']
                         stage['interviewPlanTitle'] = plan.get('title', 'Unknown')
                         all_stages.append(stage)
                         seen_stage_ids.add(stage_id)
@@ -153,12 +270,12 @@ class AshbyAPI:
     def get_users(self) -> list:
         """Fetch all users (interviewers)."""
         print("📥 Fetching users...")
-        return self._fetch_all_paginated('user.list')
+        return self._fetch_cached('user.list')
     
     def get_candidates(self) -> list:
         """Fetch all candidates."""
         print("📥 Fetching candidates...")
-        return self._fetch_all_paginated('candidate.list')
+        return self._fetch_cached('candidate.list')
     
     def get_departments(self) -> list:
         """Fetch all departments."""
@@ -175,7 +292,7 @@ class AshbyAPI:
     def get_jobs(self) -> list:
         """Fetch all jobs."""
         print("📥 Fetching jobs...")
-        return self._fetch_all_paginated('job.list')
+        return self._fetch_cached('job.list')
     
     def get_application_history(self, application_ids: list = None) -> list:
         """
@@ -193,15 +310,20 @@ class AshbyAPI:
         all_history = []
         total = len(application_ids)
         
-        for i, app_id in enumerate(application_ids):
-            if i > 0 and i % 100 == 0:
-                print(f"   Processed {i}/{total} applications...")
-            
-            result = self._post('application.listHistory', {'applicationId': app_id})
-            if result and result.get('results'):
-                for entry in result.get('results', []):
-                    entry['applicationId'] = app_id  # Add application ID to each entry
-                all_history.extend(result.get('results', []))
+        def fetch(app_id):
+            return self._post('application.listHistory', {'applicationId': app_id})
+        
+        # Each call is almost all network wait, so run them concurrently over the shared
+        # client; map() still yields results in application order
+        with ThreadPoolExecutor(max_workers=FANOUT_WORKERS) as executor:
+            for i, (app_id, result) in enumerate(zip(application_ids, executor.map(fetch, application_ids))):
+                if i > 0 and i % 100 == 0:
+                    print(f"   Processed {i}/{total} applications...")
+                
+                if result and result.get('results'):
+                    for entry in result.get('results', []):
+                        entry['applicationId'] = app_id  # Add application ID to each entry
+                    all_history.extend(result.get('results', []))
         
         print(f"   Fetched {len(all_history)} history entries for {total} applications")
         return all_history
@@ -216,251 +338,316 @@ def fetch_ashby_data() -> dict:
         print("⚠️  No ASHBY_API_KEY found. Will generate mock data.")
         return None
     
+    api = AshbyAPI(ASHBY_API_KEY)
     try:
-        api = AshbyAPI(ASHBY_API_KEY)
-        
-        # Fetch all data
-        applications = api.get_applications()
-        feedback = api.get_application_feedback()
-        interviews = api.get_interviews()
-        stages = api.get_interview_stages()
-        users = api.get_users()
-        candidates = api.get_candidates()
-        departments = api.get_departments()
-        archive_reasons = api.get_archive_reasons()
-        jobs = api.get_jobs()
+        # The endpoints are independent, so fetch them concurrently over the shared client
+        fetchers = {
+            'applications': api.get_applications,
+            'feedback': api.get_application_feedback,
+            'interviews': api.get_interviews,
+            'stages': api.get_interview_stages,
+            'users': api.get_users,
+            'candidates': api.get_candidates,
+            'departments': api.get_departments,
+            'archive_reasons': api.get_archive_reasons,
+            'jobs': api.get_jobs
+        }
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {name: executor.submit(fetch) for name, fetch in fetchers.items()}
+            data = {name: future.result() for name, future in futures.items()}
         
         print(f"\n📊 Data fetched:")
-        print(f"   Applications: {len(applications)}")
-        print(f"   Feedback: {len(feedback)}")
-        print(f"   Interviews: {len(interviews)}")
-        print(f"   Stages: {len(stages)}")
-        print(f"   Users: {len(users)}")
-        print(f"   Candidates: {len(candidates)}")
-        print(f"   Departments: {len(departments)}")
-        print(f"   Archive Reasons: {len(archive_reasons)}")
-        print(f"   Jobs: {len(jobs)}")
-        
-        return {
-            'applications': applications,
-            'feedback': feedback,
-            'interviews': interviews,
-            'stages': stages,
-            'users': users,
-            'candidates': candidates,
-            'departments': departments,
-            'archive_reasons': archive_reasons,
-            'jobs': jobs
-        }
+        print(f"   Applications: {len(data['applications'])}")
+        print(f"   Feedback: {len(data['feedback'])}")
+        print(f"   Interviews: {len(data['interviews'])}")
+        print(f"   Stages: {len(data['stages'])}")
+        print(f"   Users: {len(data['users'])}")
+        print(f"   Candidates: {len(data['candidates'])}")
+        print(f"   Departments: {len(data['departments'])}")
+        print(f"   Archive Reasons: {len(data['archive_reasons'])}")
+        print(f"   Jobs: {len(data['jobs'])}")
+        
+        return data
         
     except Exception as e:
         print(f"❌ Error fetching API data: {e}")
         import traceback
         traceback.print_exc()
         return None
+    finally:
+        api.close()
+
+
+# Pinned column types for the transformed tables. Frames are built as Arrow tables with
+# these schemas and handed to pandas without conversion, so DuckDB scans the Arrow buffers
+# directly and all-null columns don't fall back to pandas' object inference.
+# Each column is a plain comprehension over the raw dicts rather than pd.json_normalize,
+# so its type comes from the schema instead of pandas' inference over the records.
+APPLICATIONS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('candidate_id', pa.string()),
+    ('candidate_name', pa.string()),
+    ('job_id', pa.string()),
+    ('job_title', pa.string()),
+    ('department', pa.string()),
+    ('source', pa.string()),
+    ('current_stage_id', pa.string()),
+    ('current_stage_name', pa.string()),
+    ('status', pa.string()),
+    ('archived', pa.bool_()),
+    ('archive_reason', pa.string()),
+    ('hired_at', pa.string()),
+    ('created_at', pa.string()),
+    ('updated_at', pa.string()),
+])
+FEEDBACK_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('application_id', pa.string()),
+    ('interviewer_id', pa.string()),
+    ('interviewer_name', pa.string()),
+    ('interviewer_email', pa.string()),
+    ('interview_stage_id', pa.string()),
+    ('interview_id', pa.string()),
+    ('overall_rating', pa.int8()),
+    ('vote', pa.string()),
+    ('feedback_text', pa.string()),
+    ('submitted_at', pa.string()),
+    ('created_at', pa.string()),
+])
+INTERVIEWS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('application_id', pa.string()),
+    ('interview_stage_id', pa.string()),
+    ('interviewer_ids', pa.list_(pa.string())),
+    ('interviewer_count', pa.int16()),
+    ('duration_minutes', pa.float32()),
+    ('status', pa.string()),
+    ('start_time', pa.string()),
+    ('end_time', pa.string()),
+    ('created_at', pa.string()),
+])
+STAGES_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('title', pa.string()),
+    ('order_in_plan', pa.int64()),
+    ('stage_type', pa.string()),
+    ('interview_plan_id', pa.string()),
+    ('interview_plan_title', pa.string()),
+])
+USERS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('name', pa.string()),
+    ('email', pa.string()),
+    ('is_enabled', pa.bool_()),
+    ('department', pa.string()),
+])
+ARCHIVE_REASONS_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('reason_text', pa.string()),
+])
+APPLICATION_HISTORY_SCHEMA = pa.schema([
+    ('id', pa.string()),
+    ('application_id', pa.string()),
+    ('stage_id', pa.string()),
+    ('stage_name', pa.string()),
+    ('stage_number', pa.int16()),
+    ('entered_at', pa.string()),
+    ('actor_id', pa.string()),
+])
+
+
+def _arrow_frame(columns: dict, schema: pa.Schema) -> pd.DataFrame:
+    """Arrow-backed DataFrame from column lists, typed by a pinned schema."""
+    return pa.Table.from_pydict(columns, schema=schema).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _empty_frame(schema: pa.Schema) -> pd.DataFrame:
+    """Zero-row Arrow-backed DataFrame with a pinned schema's columns and types."""
+    return schema.empty_table().to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _job_title_department(job_data: dict, departments_lookup: dict) -> tuple:
+    """(title, department) for a job object, with 'Unknown' fallbacks."""
+    job_title = job_data.get('title', 'Unknown')
+    
+    # Get department - try from job data first, then from jobs lookup
+    dept_id = job_data.get('departmentId')
+    department = departments_lookup.get(dept_id, 'Unknown') if dept_id else 'Unknown'
+    
+    # If still unknown, try department from job data directly
+    if department == 'Unknown' and job_data.get('department'):
+        dept_info = job_data.get('department', {})
+        if isinstance(dept_info, dict):
+            department = dept_info.get('name', 'Unknown')
+        elif isinstance(dept_info, str):
+            department = dept_info
+    
+    return job_title, department
 
 
 def transform_applications(raw_applications: list, raw_candidates: list, raw_departments: list, raw_jobs: list) -> pd.DataFrame:
     """Transform raw application data into structured DataFrame."""
     if not raw_applications:
-        return pd.DataFrame()
+        return _empty_frame(APPLICATIONS_SCHEMA)
     
-    # Create lookup dicts
-    candidates_lookup = {c.get('id'): c for c in raw_candidates} if raw_candidates else {}
+    # Create lookup dicts, resolved to the values we need once per candidate / job
+    # rather than once per application
+    candidate_names = {c.get('id'): c.get('name', 'Unknown') for c in raw_candidates} if raw_candidates else {}
     departments_lookup = {d.get('id'): d.get('name') for d in raw_departments} if raw_departments else {}
-    jobs_lookup = {j.get('id'): j for j in raw_jobs} if raw_jobs else {}
+    job_details = {j.get('id'): _job_title_department(j, departments_lookup) for j in raw_jobs} if raw_jobs else {}
     
-    rows = []
+    job_ids, job_titles, departments = [], [], []
     for app in raw_applications:
-        candidate = candidates_lookup.get(app.get('candidateId'), {})
-        
         # Handle job - can be nested object or just jobId
         job_data = app.get('job', {}) or {}
-        job_id = job_data.get('id') if job_data else app.get('jobId')
-        job_title = job_data.get('title', 'Unknown') if job_data else 'Unknown'
-        
-        # If we have job_id but no job_data, look up from jobs table
-        if job_id and not job_data:
-            job_data = jobs_lookup.get(job_id, {})
-            job_title = job_data.get('title', 'Unknown')
-        
-        # Get department - try from job data first, then from jobs lookup
-        dept_id = job_data.get('departmentId')
-        department = departments_lookup.get(dept_id, 'Unknown') if dept_id else 'Unknown'
-        
-        # If still unknown, try department from job data directly
-        if department == 'Unknown' and job_data.get('department'):
-            dept_info = job_data.get('department', {})
-            if isinstance(dept_info, dict):
-                department = dept_info.get('name', 'Unknown')
-            elif isinstance(dept_info, str):
-                department = dept_info
-        
-        # Get current stage info
-        current_stage = app.get('currentInterviewStage', {}) or {}
-        
-        rows.append({
-            'id': app.get('id'),
-            'candidate_id': app.get('candidateId'),
-            'candidate_name': candidate.get('name', 'Unknown'),
-            'job_id': job_id,
-            'job_title': job_title,
-            'department': department,
-            'source': app.get('source', {}).get('title', 'Unknown') if isinstance(app.get('source'), dict) else str(app.get('source', 'Unknown')),
-            'current_stage_id': current_stage.get('id') if current_stage else None,
-            'current_stage_name': current_stage.get('title') if current_stage else None,
-            'status': app.get('status', 'Unknown'),
-            'archived': app.get('isArchived', False),
-            'archive_reason': app.get('archiveReason', {}).get('text') if app.get('archiveReason') else None,
-            'hired_at': app.get('hiredAt'),
-            'created_at': app.get('createdAt'),
-            'updated_at': app.get('updatedAt')
-        })
-    
-    return pd.DataFrame(rows)
+        if job_data:
+            job_id = job_data.get('id')
+            job_title, department = _job_title_department(job_data, departments_lookup)
+        else:
+            # No nested job, look up from jobs table
+            job_id = app.get('jobId')
+            job_title, department = job_details.get(job_id, ('Unknown', 'Unknown')) if job_id else ('Unknown', 'Unknown')
+        
+        job_ids.append(job_id)
+        job_titles.append(job_title)
+        departments.append(department)
+    
+    # Get current stage info
+    current_stages = [app.get('currentInterviewStage', {}) or {} for app in raw_applications]
+    
+    return _arrow_frame({
+        'id': [app.get('id') for app in raw_applications],
+        'candidate_id': [app.get('candidateId') for app in raw_applications],
+        'candidate_name': [candidate_names.get(app.get('candidateId'), 'Unknown') for app in raw_applications],
+        'job_id': job_ids,
+        'job_title': job_titles,
+        'department': departments,
+        'source': [app.get('source', {}).get('title', 'Unknown') if isinstance(app.get('source'), dict) else str(app.get('source', 'Unknown')) for app in raw_applications],
+        'current_stage_id': [stage.get('id') if stage else None for stage in current_stages],
+        'current_stage_name': [stage.get('title') if stage else None for stage in current_stages],
+        'status': [app.get('status', 'Unknown') for app in raw_applications],
+        'archived': [app.get('isArchived', False) for app in raw_applications],
+        'archive_reason': [app.get('archiveReason', {}).get('text') if app.get('archiveReason') else None for app in raw_applications],
+        'hired_at': [app.get('hiredAt') for app in raw_applications],
+        'created_at': [app.get('createdAt') for app in raw_applications],
+        'updated_at': [app.get('updatedAt') for app in raw_applications]
+    }, APPLICATIONS_SCHEMA)
+
+
+# Ashby's overall_recommendation values ("1" - "4") as descriptive votes
+RATING_VOTES = {
+    '4': 'Strong Yes',
+    '3': 'Yes', 
+    '2': 'No',
+    '1': 'Strong No'
+}
 
 
 def transform_feedback(raw_feedback: list, raw_users: list) -> pd.DataFrame:
     """Transform raw feedback data into structured DataFrame."""
     if not raw_feedback:
-        return pd.DataFrame()
-    
-    users_lookup = {u.get('id'): u for u in raw_users} if raw_users else {}
-    
-    rows = []
-    for fb in raw_feedback:
-        # Extract submittedValues (contains rating and feedback text)
-        submitted_values = fb.get('submittedValues', {}) or {}
-        
-        # Extract interviewer from submittedByUser (not interviewerId)
-        submitted_by = fb.get('submittedByUser', {}) or {}
-        interviewer_id = submitted_by.get('id')
-        interviewer_name = f"{submitted_by.get('firstName', '')} {submitted_by.get('lastName', '')}".strip() or 'Unknown'
-        interviewer_email = submitted_by.get('email', '')
-        
-        # Rating is in submittedValues.overall_recommendation (values: "1", "2", "3", "4")
-        overall_recommendation = submitted_values.get('overall_recommendation')
-        
-        # Map string values to descriptive ratings
-        rating_map = {
-            '4': 'Strong Yes',
-            '3': 'Yes', 
-            '2': 'No',
-            '1': 'Strong No'
-        }
-        vote = rating_map.get(overall_recommendation) if overall_recommendation else None
-        
-        # Convert to numeric rating (1-4)
-        overall_rating = int(overall_recommendation) if overall_recommendation and overall_recommendation.isdigit() else None
-        
+        return _empty_frame(FEEDBACK_SCHEMA)
+    
+    # Extract submittedValues (contains rating and feedback text)
+    submitted_values = [fb.get('submittedValues', {}) or {} for fb in raw_feedback]
+    
+    # Extract interviewer from submittedByUser (not interviewerId)
+    submitted_by = [fb.get('submittedByUser', {}) or {} for fb in raw_feedback]
+    
+    # Rating is in submittedValues.overall_recommendation (values: "1", "2", "3", "4");
+    # parse each distinct value once and map the rows through the results
+    recommendations = [values.get('overall_recommendation') for values in submitted_values]
+    ratings = {rec: int(rec) if rec and rec.isdigit() else None for rec in set(recommendations)}
+    
+    return _arrow_frame({
+        'id': [fb.get('id') for fb in raw_feedback],
+        'application_id': [fb.get('applicationId') for fb in raw_feedback],
+        'interviewer_id': [user.get('id') for user in submitted_by],
+        'interviewer_name': [f"{user.get('firstName', '')} {user.get('lastName', '')}".strip() or 'Unknown' for user in submitted_by],
+        'interviewer_email': [user.get('email', '') for user in submitted_by],
+        'interview_stage_id': [fb.get('interviewStageId') for fb in raw_feedback],
+        'interview_id': [fb.get('interviewId') for fb in raw_feedback],
+        # Numeric rating (1-4)
+        'overall_rating': [ratings[rec] for rec in recommendations],
+        'vote': [RATING_VOTES.get(rec) for rec in recommendations],
         # Feedback text is in submittedValues.feedback
-        feedback_text = submitted_values.get('feedback', '') or ''
-        
-        rows.append({
-            'id': fb.get('id'),
-            'application_id': fb.get('applicationId'),
-            'interviewer_id': interviewer_id,
-            'interviewer_name': interviewer_name,
-            'interviewer_email': interviewer_email,
-            'interview_stage_id': fb.get('interviewStageId'),
-            'interview_id': fb.get('interviewId'),
-            'overall_rating': overall_rating,
-            'vote': vote,
-            'feedback_text': feedback_text,
-            'submitted_at': fb.get('submittedAt') or fb.get('createdAt'),
-            'created_at': fb.get('createdAt')
-        })
-    
-    return pd.DataFrame(rows)
+        'feedback_text': [values.get('feedback', '') or '' for values in submitted_values],
+        'submitted_at': [fb.get('submittedAt') or fb.get('createdAt') for fb in raw_feedback],
+        'created_at': [fb.get('createdAt') for fb in raw_feedback]
+    }, FEEDBACK_SCHEMA)
 
 
 def transform_interviews(raw_interviews: list) -> pd.DataFrame:
     """Transform raw interview data into structured DataFrame."""
     if not raw_interviews:
-        return pd.DataFrame()
-    
-    rows = []
-    for interview in raw_interviews:
-        # Handle interviewers list
-        interviewers = interview.get('interviewers', [])
-        interviewer_ids = [i.get('id') if isinstance(i, dict) else i for i in interviewers]
-        
-        # Calculate duration if start/end times available
-        duration_minutes = None
-        if interview.get('startTime') and interview.get('endTime'):
-            try:
-                start = datetime.fromisoformat(interview['startTime'].replace('Z', '+00:00'))
-                end = datetime.fromisoformat(interview['endTime'].replace('Z', '+00:00'))
-                duration_minutes = (end - start).total_seconds() / 60
-            except:
-                pass
-        
-        rows.append({
-            'id': interview.get('id'),
-            'application_id': interview.get('applicationId'),
-            'interview_stage_id': interview.get('interviewStageId'),
-            'interviewer_ids': ','.join(interviewer_ids) if interviewer_ids else '',
-            'interviewer_count': len(interviewer_ids),
-            'duration_minutes': duration_minutes,
-            'status': interview.get('status'),
-            'start_time': interview.get('startTime'),
-            'end_time': interview.get('endTime'),
-            'created_at': interview.get('createdAt')
-        })
+        return _empty_frame(INTERVIEWS_SCHEMA)
     
-    return pd.DataFrame(rows)
+    # Handle interviewers list
+    interviewer_ids = [
+        [i.get('id') if isinstance(i, dict) else i for i in interview.get('interviewers', [])]
+        for interview in raw_interviews
+    ]
+    
+    # Duration from start/end times in one vectorized parse; missing or unparseable
+    # times coerce to NaT, which from_pandas turns into nulls
+    starts = pd.to_datetime([interview.get('startTime') for interview in raw_interviews],
+                            utc=True, errors='coerce', format='ISO8601')
+    ends = pd.to_datetime([interview.get('endTime') for interview in raw_interviews],
+                          utc=True, errors='coerce', format='ISO8601')
+    duration_minutes = pa.array((ends - starts).total_seconds() / 60, type=pa.float32(), from_pandas=True)
+    
+    return _arrow_frame({
+        'id': [interview.get('id') for interview in raw_interviews],
+        'application_id': [interview.get('applicationId') for interview in raw_interviews],
+        'interview_stage_id': [interview.get('interviewStageId') for interview in raw_interviews],
+        'interviewer_ids': interviewer_ids,
+        'interviewer_count': [len(ids) for ids in interviewer_ids],
+        'duration_minutes': duration_minutes,
+        'status': [interview.get('status') for interview in raw_interviews],
+        'start_time': [interview.get('startTime') for interview in raw_interviews],
+        'end_time': [interview.get('endTime') for interview in raw_interviews],
+        'created_at': [interview.get('createdAt') for interview in raw_interviews]
+    }, INTERVIEWS_SCHEMA)
 
 
 def transform_stages(raw_stages: list) -> pd.DataFrame:
     """Transform raw stage data into structured DataFrame."""
     if not raw_stages:
-        return pd.DataFrame()
-    
-    rows = []
-    for stage in raw_stages:
-        rows.append({
-            'id': stage.get('id'),
-            'title': stage.get('title', 'Unknown'),
-            'order_in_plan': stage.get('orderInInterviewPlan', 0),
-            'stage_type': stage.get('type', 'Unknown'),
-            'interview_plan_id': stage.get('interviewPlanId'),
-            'interview_plan_title': stage.get('interviewPlanTitle', 'Unknown')
-        })
-    
-    return pd.DataFrame(rows)
+        return _empty_frame(STAGES_SCHEMA)
+    
+    return _arrow_frame({
+        'id': [stage.get('id') for stage in raw_stages],
+        'title': [stage.get('title', 'Unknown') for stage in raw_stages],
+        'order_in_plan': [stage.get('orderInInterviewPlan', 0) for stage in raw_stages],
+        'stage_type': [stage.get('type', 'Unknown') for stage in raw_stages],
+        'interview_plan_id': [stage.get('interviewPlanId') for stage in raw_stages],
+        'interview_plan_title': [stage.get('interviewPlanTitle', 'Unknown') for stage in raw_stages]
+    }, STAGES_SCHEMA)
 
 
 def transform_users(raw_users: list) -> pd.DataFrame:
     """Transform raw user data into structured DataFrame."""
     if not raw_users:
-        return pd.DataFrame()
-    
-    rows = []
-    for user in raw_users:
-        rows.append({
-            'id': user.get('id'),
-            'name': user.get('name', 'Unknown'),
-            'email': user.get('email', ''),
-            'is_enabled': user.get('isEnabled', True),
-            'department': user.get('department', {}).get('name') if isinstance(user.get('department'), dict) else None
-        })
-    
-    return pd.DataFrame(rows)
+        return _empty_frame(USERS_SCHEMA)
+    
+    return _arrow_frame({
+        'id': [user.get('id') for user in raw_users],
+        'name': [user.get('name', 'Unknown') for user in raw_users],
+        'email': [user.get('email', '') for user in raw_users],
+        'is_enabled': [user.get('isEnabled', True) for user in raw_users],
+        'department': [user.get('department', {}).get('name') if isinstance(user.get('department'), dict) else None for user in raw_users]
+    }, USERS_SCHEMA)
 
 
 def transform_archive_reasons(raw_reasons: list) -> pd.DataFrame:
     """Transform raw archive reason data into structured DataFrame."""
     if not raw_reasons:
-        return pd.DataFrame()
+        return _empty_frame(ARCHIVE_REASONS_SCHEMA)
     
-    rows = []
-    for reason in raw_reasons:
-        rows.append({
-            'id': reason.get('id'),
-            'reason_text': reason.get('text', '') or reason.get('title', 'Unknown')
-        })
-    
-    return pd.DataFrame(rows)
+    return _arrow_frame({
+        'id': [reason.get('id') for reason in raw_reasons],
+        'reason_text': [reason.get('text', '') or reason.get('title', 'Unknown') for reason in raw_reasons]
+    }, ARCHIVE_REASONS_SCHEMA)
 
 
 def transform_application_history(raw_history: list) -> pd.DataFrame:
@@ -469,21 +656,17 @@ def transform_application_history(raw_history: list) -> pd.DataFrame:
     Each row represents a stage transition for an application.
     """
     if not raw_history:
-        return pd.DataFrame()
-    
-    rows = []
-    for entry in raw_history:
-        rows.append({
-            'id': entry.get('id'),
-            'application_id': entry.get('applicationId'),
-            'stage_id': entry.get('stageId'),
-            'stage_name': entry.get('title', 'Unknown'),
-            'stage_number': entry.get('stageNumber'),
-            'entered_at': entry.get('enteredStageAt'),
-            'actor_id': entry.get('actorId'),
-        })
-    
-    df = pd.DataFrame(rows)
+        return _empty_frame(APPLICATION_HISTORY_SCHEMA)
+    
+    df = _arrow_frame({
+        'id': [entry.get('id') for entry in raw_history],
+        'application_id': [entry.get('applicationId') for entry in raw_history],
+        'stage_id': [entry.get('stageId') for entry in raw_history],
+        'stage_name': [entry.get('title', 'Unknown') for entry in raw_history],
+        'stage_number': [entry.get('stageNumber') for entry in raw_history],
+        'entered_at': [entry.get('enteredStageAt') for entry in raw_history],
+        'actor_id': [entry.get('actorId') for entry in raw_history],
+    }, APPLICATION_HISTORY_SCHEMA)
     
     # Sort by application and entry time for proper sequencing
     if len(df) > 0 and 'entered_at' in df.columns:
@@ -550,56 +733,85 @@ def generate_mock_data() -> dict:
         'stage_6': 0.10,  # Hired
     }
     
+    # Every random draw is made up front as one array per column; the loops below only index
+    stage_draw = np.random.choice(list(stage_distribution.keys()), size=n_applications,
+                                  p=list(stage_distribution.values())).tolist()
+    archive_draw = np.random.random(n_applications)
+    reason_draw = np.random.choice([r for r in archive_reasons if r], size=n_applications).tolist()
+    dept_draw = np.random.choice(departments, size=n_applications, p=[0.45, 0.15, 0.10, 0.15, 0.10, 0.05]).tolist()
+    first_name_draw = np.random.choice(first_names, n_applications).tolist()
+    last_name_draw = np.random.choice(last_names, n_applications).tolist()
+    job_draw = np.random.randint(1, 20, n_applications).tolist()
+    role_draw = np.random.randint(1, 5, n_applications).tolist()
+    source_draw = np.random.choice(sources, n_applications).tolist()
+    age_draw = np.random.randint(1, 365, n_applications).tolist()
+    
+    stage_titles = {s['id']: s['title'] for s in stages_data}
+    now = datetime.now()
+    
     applications_data = []
     for i in range(n_applications):
         # Determine current stage based on funnel
-        current_stage_id = np.random.choice(
-            list(stage_distribution.keys()),
-            p=list(stage_distribution.values())
-        )
-        current_stage_name = next(s['title'] for s in stages_data if s['id'] == current_stage_id)
+        current_stage_id = stage_draw[i]
         
         # Determine status
         if current_stage_id == 'stage_6':
             status = 'Hired'
             archived = False
             archive_reason = None
-        elif np.random.random() < 0.3:  # 30% archived at various stages
+        elif archive_draw[i] < 0.3:  # 30% archived at various stages
             status = 'Archived'
             archived = True
-            archive_reason = np.random.choice([r for r in archive_reasons if r])
+            archive_reason = reason_draw[i]
         else:
             status = 'Active'
             archived = False
             archive_reason = None
         
-        dept = np.random.choice(departments, p=[0.45, 0.15, 0.10, 0.15, 0.10, 0.05])
+        dept = dept_draw[i]
         
         applications_data.append({
             'id': f'app_{i}',
             'candidate_id': f'cand_{i}',
-            'candidate_name': f'{np.random.choice(first_names)} {np.random.choice(last_names)}',
-            'job_id': f'job_{np.random.randint(1, 20)}',
-            'job_title': f'{dept} Role {np.random.randint(1, 5)}',
+            'candidate_name': f'{first_name_draw[i]} {last_name_draw[i]}',
+            'job_id': f'job_{job_draw[i]}',
+            'job_title': f'{dept} Role {role_draw[i]}',
             'department': dept,
-            'source': np.random.choice(sources),
+            'source': source_draw[i],
             'current_stage_id': current_stage_id,
-            'current_stage_name': current_stage_name,
+            'current_stage_name': stage_titles[current_stage_id],
             'status': status,
             'archived': archived,
             'archive_reason': archive_reason,
-            'hired_at': datetime.now().isoformat() if status == 'Hired' else None,
-            'created_at': (datetime.now() - timedelta(days=np.random.randint(1, 365))).isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'hired_at': now.isoformat() if status == 'Hired' else None,
+            'created_at': (now - timedelta(days=age_draw[i])).isoformat(),
+            'updated_at': now.isoformat()
         })
     
     applications_df = pd.DataFrame(applications_data)
     
+    # Feedback and interviews both happen for stages 2-4 (Screen through Onsite)
+    # that each application has reached: one (application, stage) pair per group
+    groups = [
+        (app_idx, stage_num)
+        for app_idx, app in enumerate(applications_data)
+        for stage_num in range(2, min(int(app['current_stage_id'].split('_')[1]) + 1, 5))
+    ]
+    group_app = np.array([app_idx for app_idx, _ in groups], dtype=int)
+    group_stage = np.array([stage_num for _, stage_num in groups], dtype=int)
+    n_groups = len(groups)
+    
+    interviewer_pool = np.array(interviewers_df['id'].tolist())
+    # name/email per interviewer id, so rows don't scan interviewers_df
+    interviewer_info = interviewers_df.set_index('id')[['name', 'email']].to_dict('index')
+    
+    def sample_interviewers(counts):
+        """Per group, `counts[g]` distinct interviewers; rows of a random permutation, flattened."""
+        order = np.argsort(np.random.random((len(counts), len(interviewer_pool))), axis=1)
+        return interviewer_pool[order[np.arange(len(interviewer_pool)) < counts[:, None]]]
+    
     # --- Feedback ---
     # Generate feedback for applications past recruiter screen
-    feedback_data = []
-    feedback_id = 0
-    
     rubric_categories = ['Technical Skills', 'Communication', 'Problem Solving', 'Culture Fit', 'Experience']
     votes = ['Strong Hire', 'Hire', 'No Hire', 'Strong No Hire']
     vote_weights = [0.15, 0.35, 0.35, 0.15]
@@ -622,94 +834,73 @@ def generate_mock_data() -> dict:
         "Struggled with system design concepts.",
     ]
     
-    for app in applications_data:
-        stage_order = int(app['current_stage_id'].split('_')[1])
-        
-        # Generate feedback for stages 2-4 (Screen through Onsite)
-        for stage_num in range(2, min(stage_order + 1, 5)):
-            stage_id = f'stage_{stage_num}'
-            
-            # Number of interviewers depends on stage
-            if stage_num == 2:  # Recruiter Screen
-                n_interviewers = 1
-            elif stage_num == 3:  # Technical Screen
-                n_interviewers = np.random.randint(1, 3)
-            else:  # Onsite
-                n_interviewers = np.random.randint(3, 6)
-            
-            selected_interviewers = np.random.choice(interviewers_df['id'].tolist(), n_interviewers, replace=False)
-            
-            for interviewer_id in selected_interviewers:
-                interviewer = interviewers_df[interviewers_df['id'] == interviewer_id].iloc[0]
-                
-                # Determine vote based on outcome
-                if app['status'] == 'Hired':
-                    vote = np.random.choice(votes[:2], p=[0.3, 0.7])  # Mostly Hire
-                elif app['archived'] and app['archive_reason'] in ['Failed technical', 'Failed culture', 'Not a fit']:
-                    vote = np.random.choice(votes[2:], p=[0.7, 0.3])  # Mostly No Hire
-                else:
-                    vote = np.random.choice(votes, p=vote_weights)
-                
-                # Generate feedback text
-                if vote in ['Strong Hire', 'Hire']:
-                    feedback_text = np.random.choice(positive_themes)
-                else:
-                    feedback_text = np.random.choice(negative_themes)
-                
-                feedback_data.append({
-                    'id': f'fb_{feedback_id}',
-                    'application_id': app['id'],
-                    'interviewer_id': interviewer_id,
-                    'interviewer_name': interviewer['name'],
-                    'interviewer_email': interviewer['email'],
-                    'interview_stage_id': stage_id,
-                    'interview_id': f'interview_{feedback_id}',
-                    'overall_rating': np.random.randint(1, 6),  # 1-5 scale
-                    'vote': vote,
-                    'feedback_text': feedback_text,
-                    'submitted_at': app['created_at'],
-                    'created_at': app['created_at']
-                })
-                feedback_id += 1
-    
-    feedback_df = pd.DataFrame(feedback_data)
+    # Number of interviewers depends on stage: 1 for Recruiter Screen, 1-2 Technical, 3-5 Onsite
+    feedback_counts = np.select(
+        [group_stage == 2, group_stage == 3],
+        [np.ones(n_groups, dtype=int), np.random.randint(1, 3, n_groups)],
+        np.random.randint(3, 6, n_groups)
+    )
+    row_group = np.repeat(np.arange(n_groups), feedback_counts)
+    row_app = group_app[row_group]
+    row_interviewer = sample_interviewers(feedback_counts)
+    n_feedback = len(row_group)
+    
+    # Determine vote based on outcome
+    app_hired = np.array([app['status'] == 'Hired' for app in applications_data])
+    app_failed = np.array([
+        app['archived'] and app['archive_reason'] in ['Failed technical', 'Failed culture', 'Not a fit']
+        for app in applications_data
+    ])
+    vote = np.select(
+        [app_hired[row_app], app_failed[row_app]],
+        [np.random.choice(votes[:2], n_feedback, p=[0.3, 0.7]),   # Mostly Hire
+         np.random.choice(votes[2:], n_feedback, p=[0.7, 0.3])],  # Mostly No Hire
+        np.random.choice(votes, n_feedback, p=vote_weights)
+    )
+    
+    # Generate feedback text
+    feedback_text = np.where(
+        np.isin(vote, ['Strong Hire', 'Hire']),
+        np.random.choice(positive_themes, n_feedback),
+        np.random.choice(negative_themes, n_feedback)
+    )
+    
+    row_created = [applications_data[app_idx]['created_at'] for app_idx in row_app]
+    feedback_df = pd.DataFrame({
+        'id': [f'fb_{i}' for i in range(n_feedback)],
+        'application_id': [applications_data[app_idx]['id'] for app_idx in row_app],
+        'interviewer_id': row_interviewer,
+        'interviewer_name': [interviewer_info[iid]['name'] for iid in row_interviewer],
+        'interviewer_email': [interviewer_info[iid]['email'] for iid in row_interviewer],
+        'interview_stage_id': [f'stage_{stage_num}' for stage_num in group_stage[row_group]],
+        'interview_id': [f'interview_{i}' for i in range(n_feedback)],
+        'overall_rating': np.random.randint(1, 6, n_feedback).astype(np.int8),  # 1-5 scale
+        'vote': vote,
+        'feedback_text': feedback_text,
+        'submitted_at': row_created,
+        'created_at': row_created
+    })
     
     # --- Interviews ---
-    interviews_data = []
-    interview_id = 0
-    
-    for app in applications_data:
-        stage_order = int(app['current_stage_id'].split('_')[1])
-        
-        for stage_num in range(2, min(stage_order + 1, 5)):
-            stage_id = f'stage_{stage_num}'
-            
-            # Duration based on stage
-            if stage_num == 2:
-                duration = np.random.randint(30, 45)
-            elif stage_num == 3:
-                duration = np.random.randint(45, 60)
-            else:
-                duration = np.random.randint(45, 60)
-            
-            n_interviewers = np.random.randint(1, 4)
-            interviewer_ids = np.random.choice(interviewers_df['id'].tolist(), n_interviewers, replace=False)
-            
-            interviews_data.append({
-                'id': f'interview_{interview_id}',
-                'application_id': app['id'],
-                'interview_stage_id': stage_id,
-                'interviewer_ids': ','.join(interviewer_ids),
-                'interviewer_count': n_interviewers,
-                'duration_minutes': duration,
-                'status': 'Completed',
-                'start_time': app['created_at'],
-                'end_time': app['created_at'],
-                'created_at': app['created_at']
-            })
-            interview_id += 1
-    
-    interviews_df = pd.DataFrame(interviews_data)
+    # Duration based on stage
+    duration = np.where(group_stage == 2, np.random.randint(30, 45, n_groups), np.random.randint(45, 60, n_groups))
+    
+    interviewer_counts = np.random.randint(1, 4, n_groups)
+    interviewer_groups = np.split(sample_interviewers(interviewer_counts), np.cumsum(interviewer_counts)[:-1])
+    
+    group_created = [applications_data[app_idx]['created_at'] for app_idx in group_app]
+    interviews_df = pd.DataFrame({
+        'id': [f'interview_{i}' for i in range(n_groups)],
+        'application_id': [applications_data[app_idx]['id'] for app_idx in group_app],
+        'interview_stage_id': [f'stage_{stage_num}' for stage_num in group_stage],
+        'interviewer_ids': [ids.tolist() for ids in interviewer_groups],
+        'interviewer_count': interviewer_counts.astype(np.int16),
+        'duration_minutes': duration.astype(np.float32),
+        'status': 'Completed',
+        'start_time': group_created,
+        'end_time': group_created,
+        'created_at': group_created
+    })
     
     # --- Archive Reasons ---
     archive_reasons_df = pd.DataFrame({
@@ -720,14 +911,17 @@ def generate_mock_data() -> dict:
     # --- Employees (for false positive analysis) ---
     # Simulate some hired candidates who left
     hired_apps = applications_df[applications_df['status'] == 'Hired'].head(50)
+    hire_draw = np.random.randint(30, 500, len(hired_apps)).tolist()
+    left_draw = np.random.random(len(hired_apps))
+    tenure_draw = np.random.randint(30, 365, len(hired_apps)).tolist()
     employees_data = []
     
-    for idx, app in hired_apps.iterrows():
-        hire_date = datetime.now() - timedelta(days=np.random.randint(30, 500))
+    for k, (idx, app) in enumerate(hired_apps.iterrows()):
+        hire_date = now - timedelta(days=hire_draw[k])
         
         # 20% left within a year
-        if np.random.random() < 0.2:
-            departure_date = hire_date + timedelta(days=np.random.randint(30, 365))
+        if left_draw[k] < 0.2:
+            departure_date = hire_date + timedelta(days=tenure_draw[k])
         else:
             departure_date = None
         
@@ -754,18 +948,96 @@ def generate_mock_data() -> dict:
     }
 
 
+def refresh_stage_cohorts(conn) -> None:
+    """
+    Rebuild the tables derived from application_history.
+    
+    Called after application_history is reloaded, so the dashboard joins
+    against small precomputed tables instead of rescanning stage names.
+    
+    Args:
+        conn: Writable DuckDB connection
+    """
+    # Normalize stage names once here so cohort filters are plain equality
+    conn.execute("ALTER TABLE application_history ADD COLUMN IF NOT EXISTS stage_category VARCHAR")
+    conn.execute("""
+        UPDATE application_history SET stage_category = CASE
+            WHEN stage_name ILIKE '%onsite%' OR stage_name IN ('All Around', 'Work Trial') THEN 'onsite'
+            WHEN stage_name ILIKE '%offer%' THEN 'offer'
+            WHEN stage_name ILIKE '%phone screen%' OR stage_name ILIKE '%recruiter screen%' THEN 'phone_screen'
+            WHEN stage_name ILIKE '%hired%' THEN 'hired'
+            ELSE 'other'
+        END
+    """)
+    
+    # One row per (application, stage) so the funnel queries skip the dedup;
+    # stage_group folds every onsite variant into 'Onsite' for equality filters
+    conn.execute("""
+        CREATE OR REPLACE TABLE app_stage_reached AS
+        SELECT DISTINCT application_id, stage_name,
+            CASE WHEN stage_category = 'onsite' THEN 'Onsite' ELSE stage_name END as stage_group
+        FROM application_history
+    """)
+    
+    # Applications that ever reached Onsite / Offer
+    conn.execute("""
+        CREATE OR REPLACE TABLE onsite_application_ids AS
+        SELECT DISTINCT application_id
+        FROM application_history
+        WHERE stage_category = 'onsite'
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_onsite_application_ids ON onsite_application_ids(application_id)")
+    
+    conn.execute("""
+        CREATE OR REPLACE TABLE offer_application_ids AS
+        SELECT DISTINCT application_id
+        FROM application_history
+        WHERE stage_category = 'offer'
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_offer_application_ids ON offer_application_ids(application_id)")
+
+
+def export_parquet(conn) -> None:
+    """
+    Write the applications columns the dashboard filters on to Parquet.
+    
+    Called after the applications table is reloaded. Row groups carry
+    min/max stats, so department filters skip groups without reading them.
+    
+    Args:
+        conn: DuckDB connection with the applications table
+    """
+    conn.execute(f"""
+        COPY (
+            SELECT id, department, source, current_stage_name, archive_reason
+            FROM applications
+            ORDER BY department
+        ) TO '{APPLICATIONS_PARQUET}' (FORMAT PARQUET, ROW_GROUP_SIZE 100000)
+    """)
+
+
 def save_to_duckdb(dataframes: dict):
     """Save all DataFrames to DuckDB."""
     print(f"\n💾 Saving to DuckDB: {DB_PATH}")
     
-    conn = duckdb.connect(str(DB_PATH))
+    conn = duckdb.connect(str(DB_PATH), config=LOAD_DB_CONFIG)
     
+    # All tables land in one transaction; each is a single columnar scan of its DataFrame's
+    # Arrow buffers, which already is DuckDB's bulk path (staging through Parquet only adds
+    # a write and a decode)
+    conn.begin()
     for table_name, df in dataframes.items():
         if df is not None and len(df) > 0:
             # Register DataFrame and create table
             conn.register(f'temp_{table_name}', df)
             conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM temp_{table_name}")
+            conn.unregister(f'temp_{table_name}')
             print(f"   ✅ {table_name}: {len(df)} rows")
+    conn.commit()
+    
+    if 'applications' in dataframes and dataframes['applications'] is not None and len(dataframes['applications']) > 0:
+        export_parquet(conn)
+        print("   ✅ applications.parquet exported")
     
     conn.close()
     print(f"\n✅ Data saved to {DB_PATH}")
@@ -6,7 +6,9 @@ import pandas as pd
 import numpy as np
 import duckdb
 from pathlib import Path
+from typing import NamedTuple
 import os
+import tempfile
 from openai import OpenAI
 import json
 
@@ -14,6 +16,15 @@ import json
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / 'data'
 DB_PATH = DATA_DIR / 'interview_analytics.duckdb'
+APPLICATIONS_PARQUET = DATA_DIR / 'applications.parquet'
+# Applied once when the database is opened, bounding what the dashboard can take from the host.
+# Queries over memory_limit spill to temp_directory instead of failing; the default spill
+# location sits next to the database file, which a read-only deployment may not be able to write.
+DB_CONFIG = {
+    'threads': 4,
+    'memory_limit': '2GB',
+    'temp_directory': str(Path(tempfile.gettempdir()) / 'duckdb_spill'),
+}
 
 # OpenAI client (lazy loaded)
 _openai_client = None
@@ -31,7 +42,25 @@ def get_openai_client():
 
 def get_db_connection():
     """Get DuckDB connection."""
-    return duckdb.connect(str(DB_PATH), read_only=True)
+    return duckdb.connect(str(DB_PATH), read_only=True, config=DB_CONFIG)
+
+
+def _arrow_df(result) -> pd.DataFrame:
+    """Arrow-backed DataFrame from a DuckDB result, skipping the numpy copy."""
+    return result.to_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _select_list(columns: list, allowed: list) -> str:
+    """
+    Build a SELECT column list from the requested columns.
+    
+    Only names in `allowed` are kept, so callers can't inject SQL.
+    Falls back to '*' when nothing (valid) was requested.
+    """
+    if not columns:
+        return "*"
+    selected = [c for c in columns if c in allowed]
+    return ", ".join(selected) if selected else "*"
 
 
 # =============================================================================
@@ -50,12 +79,12 @@ def calculate_funnel_ratios(department: str = None) -> dict:
     # Get stage order
     stages_df = conn.execute("SELECT * FROM stages ORDER BY order_in_plan").df()
     
-    # Build query with optional department filter
-    where_clause = f"WHERE a.department = '{department}'" if department else ""
-    where_clause_apps = f"WHERE department = '{department}'" if department else ""
+    # Optional department filter; a NULL parameter matches every row, so the
+    # query text is the same for every department
+    dept_params = [department, department]
     
     # Count applications at each stage
-    query = f"""
+    query = """
     SELECT 
         current_stage_id,
         current_stage_name,
@@ -63,27 +92,27 @@ def calculate_funnel_ratios(department: str = None) -> dict:
         SUM(CASE WHEN status = 'Hired' THEN 1 ELSE 0 END) as hired_count,
         SUM(CASE WHEN archived THEN 1 ELSE 0 END) as archived_count
     FROM applications
-    {where_clause_apps}
+    WHERE (CAST(? AS VARCHAR) IS NULL OR department = ?)
     GROUP BY current_stage_id, current_stage_name
     """
     
-    stage_counts = conn.execute(query).df()
+    stage_counts = conn.execute(query, dept_params).df()
     
     # Get total applications
-    total_query = f"SELECT COUNT(*) as total FROM applications {where_clause_apps}"
-    total = conn.execute(total_query).df()['total'].iloc[0]
+    total_query = "SELECT COUNT(*) as total FROM applications WHERE (CAST(? AS VARCHAR) IS NULL OR department = ?)"
+    total = conn.execute(total_query, dept_params).df()['total'].iloc[0]
     
     # Calculate interview hours using FEEDBACK as proxy (1 hour per feedback entry)
     # This is more reliable than the interviews table which may lack duration data
-    feedback_hours_query = f"""
+    feedback_hours_query = """
     SELECT 
         COUNT(*) as interview_count
     FROM feedback f
     JOIN applications a ON f.application_id = a.id
-    {where_clause}
+    WHERE (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
     """
     try:
-        feedback_stats = conn.execute(feedback_hours_query).df()
+        feedback_stats = conn.execute(feedback_hours_query, dept_params).df()
         interview_count = int(feedback_stats['interview_count'].iloc[0] or 0)
     except:
         interview_count = 0
@@ -93,8 +122,8 @@ def calculate_funnel_ratios(department: str = None) -> dict:
     avg_interview_duration = 60  # 60 minutes assumed
     
     # Calculate hours per hire
-    hired_query = f"SELECT COUNT(*) FROM applications {where_clause_apps} {'AND' if where_clause_apps else 'WHERE'} status = 'Hired'"
-    hired_count = conn.execute(hired_query).fetchone()[0]
+    hired_query = "SELECT COUNT(*) FROM applications WHERE (CAST(? AS VARCHAR) IS NULL OR department = ?) AND status = 'Hired'"
+    hired_count = conn.execute(hired_query, dept_params).fetchone()[0]
     hours_per_hire = total_interview_hours / hired_count if hired_count > 0 else 0
     
     conn.close()
@@ -133,21 +162,19 @@ def get_funnel_sankey_data(department: str = None) -> dict:
     """Get data formatted for Sankey diagram."""
     conn = get_db_connection()
     
-    where_clause = f"WHERE department = '{department}'" if department else ""
-    
     # Get stage transitions
-    query = f"""
+    query = """
     SELECT 
         current_stage_name as stage,
         status,
         COUNT(*) as count
     FROM applications
-    {where_clause}
+    WHERE (CAST(? AS VARCHAR) IS NULL OR department = ?)
     GROUP BY current_stage_name, status
     ORDER BY current_stage_name
     """
     
-    df = conn.execute(query).df()
+    df = conn.execute(query, [department, department]).df()
     conn.close()
     
     return df.to_dict('records')
@@ -161,8 +188,6 @@ def get_rejection_feedback(department: str = None, onsite_only: bool = False) ->
     """Get feedback for rejected/archived candidates."""
     conn = get_db_connection()
     
-    dept_filter = f"AND a.department = '{department}'" if department else ""
-    
     # Check if we have application_history table for onsite filtering
     has_history = False
     try:
@@ -171,7 +196,7 @@ def get_rejection_feedback(department: str = None, onsite_only: bool = False) ->
         pass
     
     if onsite_only and has_history:
-        query = f"""
+        query = """
         WITH onsite_candidates AS (
             SELECT DISTINCT h.application_id
             FROM application_history h
@@ -194,11 +219,11 @@ def get_rejection_feedback(department: str = None, onsite_only: bool = False) ->
         WHERE a.current_stage_name = 'Archived'
         AND f.feedback_text IS NOT NULL
         AND f.feedback_text != ''
-        {dept_filter}
+        AND (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
         LIMIT 500
         """
     else:
-        query = f"""
+        query = """
         SELECT 
             f.feedback_text,
             f.vote,
@@ -213,11 +238,64 @@ def get_rejection_feedback(department: str = None, onsite_only: bool = False) ->
         WHERE a.current_stage_name = 'Archived'
         AND f.feedback_text IS NOT NULL
         AND f.feedback_text != ''
-        {dept_filter}
+        AND (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
         LIMIT 500
         """
     
-    df = conn.execute(query).df()
+    df = conn.execute(query, [department, department]).df()
+    conn.close()
+    
+    return df
+
+
+def get_rejection_feedback_texts(department: str = None, onsite_only: bool = False) -> pd.DataFrame:
+    """
+    Get distinct rejection feedback texts for theme analysis.
+    
+    Same filters as get_rejection_feedback, but texts are deduplicated and
+    capped at the 200 most repeated, which is all the theme analysis needs
+    and keeps the LLM payload small.
+    
+    Returns:
+        DataFrame with 'feedback_text' and 'occurrences'
+    """
+    conn = get_db_connection()
+    
+    # Check if we have application_history table for onsite filtering
+    has_history = False
+    try:
+        has_history = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='application_history'").fetchone()[0] > 0
+    except:
+        pass
+    
+    if onsite_only and has_history:
+        onsite_join = """
+        JOIN (
+            SELECT DISTINCT h.application_id
+            FROM application_history h
+            WHERE h.stage_name ILIKE '%onsite%' 
+               OR h.stage_name = 'All Around'
+               OR h.stage_name = 'Work Trial'
+        ) oc ON a.id = oc.application_id"""
+    else:
+        onsite_join = ""
+    
+    query = f"""
+    SELECT 
+        f.feedback_text,
+        COUNT(*) as occurrences
+    FROM feedback f
+    JOIN applications a ON f.application_id = a.id{onsite_join}
+    WHERE a.current_stage_name = 'Archived'
+    AND f.feedback_text IS NOT NULL
+    AND f.feedback_text != ''
+    AND (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
+    GROUP BY f.feedback_text
+    ORDER BY occurrences DESC, LENGTH(f.feedback_text) DESC
+    LIMIT 200
+    """
+    
+    df = conn.execute(query, [department, department]).df()
     conn.close()
     
     return df
@@ -275,9 +353,7 @@ def get_source_patterns(department: str = None) -> pd.DataFrame:
     """Analyze patterns by source for rejected vs hired candidates."""
     conn = get_db_connection()
     
-    dept_where = f"WHERE department = '{department}'" if department else ""
-    
-    query = f"""
+    query = """
     SELECT 
         source,
         COUNT(*) as total,
@@ -285,13 +361,13 @@ def get_source_patterns(department: str = None) -> pd.DataFrame:
         SUM(CASE WHEN archived THEN 1 ELSE 0 END) as archived,
         ROUND(SUM(CASE WHEN status = 'Hired' THEN 1.0 ELSE 0 END) / COUNT(*) * 100, 1) as hire_rate
     FROM applications
-    {dept_where}
+    WHERE (CAST(? AS VARCHAR) IS NULL OR department = ?)
     GROUP BY source
     HAVING COUNT(*) > 5
     ORDER BY hire_rate DESC
     """
     
-    df = conn.execute(query).df()
+    df = conn.execute(query, [department, department]).df()
     conn.close()
     
     return df
@@ -301,7 +377,83 @@ def get_source_patterns(department: str = None) -> pd.DataFrame:
 # TAB 3: FALSE NEGATIVE DETECTIVE
 # =============================================================================
 
-def detect_false_negatives(rating_threshold: float = 3.0, department: str = None) -> pd.DataFrame:
+class FalseNegativeBundle(NamedTuple):
+    """Every False Negatives tab result, loaded over one connection."""
+    false_negatives: pd.DataFrame
+    rejection_characteristics: pd.DataFrame
+    dissenting_votes: pd.DataFrame
+    close_calls: pd.DataFrame
+    rehires: pd.DataFrame
+    archive_reasons: pd.DataFrame
+    archive_signals: dict
+
+
+def _load_fn_feedback(conn, department: str = None) -> None:
+    """
+    Materialize feedback joined to its application as the temp table fn_feedback.
+    
+    The feedback-based analyses below all aggregate this same join, so it
+    is scanned once per connection and each query reads the temp table.
+    """
+    conn.execute("""
+    CREATE OR REPLACE TEMP TABLE fn_feedback AS
+    SELECT 
+        f.application_id,
+        f.vote,
+        f.overall_rating,
+        f.interviewer_name,
+        a.candidate_name,
+        a.department,
+        a.source,
+        a.archive_reason,
+        a.current_stage_name
+    FROM feedback f
+    JOIN applications a ON f.application_id = a.id
+    WHERE (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
+    """, [department, department])
+
+
+def get_false_negative_bundle(department: str = None, rating_threshold: float = 3.0,
+                              columns: dict = None) -> FalseNegativeBundle:
+    """
+    Run all False Negatives analyses on one connection.
+    
+    feedback ⋈ applications is materialized once (fn_feedback) and shared by
+    the false negative, dissenting vote and close call queries.
+    
+    Args:
+        department: Optional department filter
+        rating_threshold: Minimum avg rating for detect_false_negatives
+        columns: Optional {'false_negatives' | 'dissenting_votes' | 'close_calls' | 'rehires': [cols]}
+    
+    Returns:
+        FalseNegativeBundle
+    """
+    columns = columns or {}
+    conn = get_db_connection()
+    try:
+        _load_fn_feedback(conn, department)
+        return FalseNegativeBundle(
+            false_negatives=detect_false_negatives(rating_threshold, columns=columns.get('false_negatives'), conn=conn),
+            rejection_characteristics=get_rejection_characteristics(conn=conn),
+            dissenting_votes=get_dissenting_votes(columns=columns.get('dissenting_votes'), conn=conn),
+            close_calls=get_close_call_decisions(columns=columns.get('close_calls'), conn=conn),
+            rehires=get_rehire_patterns(department, columns=columns.get('rehires'), conn=conn),
+            archive_reasons=get_archive_reason_analysis(department, conn=conn),
+            archive_signals=get_archive_signal_counts(department, conn=conn),
+        )
+    finally:
+        conn.close()
+
+
+FALSE_NEGATIVE_COLUMNS = [
+    'application_id', 'candidate_name', 'department', 'source', 'archive_reason',
+    'feedback_count', 'avg_rating', 'max_rating', 'min_rating', 'no_hire_votes', 'hire_votes'
+]
+
+
+def detect_false_negatives(rating_threshold: float = 3.0, department: str = None,
+                           columns: list = None, conn=None) -> pd.DataFrame:
     """
     Find archived candidates who had high technical scores but were rejected.
     
@@ -314,53 +466,57 @@ def detect_false_negatives(rating_threshold: float = 3.0, department: str = None
     Args:
         rating_threshold: Minimum avg rating to be considered "high" (1-4 scale)
         department: Optional department filter
+        columns: Optional subset of FALSE_NEGATIVE_COLUMNS to return
+        conn: Connection with fn_feedback already loaded; department is then ignored
     
     Returns:
         DataFrame of potential false negatives
     """
-    conn = get_db_connection()
-    
-    dept_filter = f"AND a.department = '{department}'" if department else ""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        _load_fn_feedback(conn, department)
     
     query = f"""
     WITH candidate_feedback AS (
         SELECT 
-            f.application_id,
-            a.candidate_name,
-            a.department,
-            a.source,
-            a.archive_reason,
+            application_id,
+            candidate_name,
+            department,
+            source,
+            archive_reason,
             COUNT(*) as feedback_count,
-            AVG(f.overall_rating) as avg_rating,
-            MAX(f.overall_rating) as max_rating,
-            MIN(f.overall_rating) as min_rating,
-            SUM(CASE WHEN f.vote IN ('No', 'Strong No') THEN 1 ELSE 0 END) as no_hire_votes,
-            SUM(CASE WHEN f.vote IN ('Yes', 'Strong Yes') THEN 1 ELSE 0 END) as hire_votes
-        FROM feedback f
-        JOIN applications a ON f.application_id = a.id
-        WHERE a.current_stage_name = 'Archived'
-        AND f.overall_rating IS NOT NULL
-        {dept_filter}
-        GROUP BY f.application_id, a.candidate_name, a.department, a.source, a.archive_reason
+            AVG(overall_rating) as avg_rating,
+            MAX(overall_rating) as max_rating,
+            MIN(overall_rating) as min_rating,
+            SUM(CASE WHEN vote IN ('No', 'Strong No') THEN 1 ELSE 0 END) as no_hire_votes,
+            SUM(CASE WHEN vote IN ('Yes', 'Strong Yes') THEN 1 ELSE 0 END) as hire_votes
+        FROM fn_feedback
+        WHERE current_stage_name = 'Archived'
+        AND overall_rating IS NOT NULL
+        GROUP BY application_id, candidate_name, department, source, archive_reason
     )
-    SELECT *
+    SELECT {_select_list(columns, FALSE_NEGATIVE_COLUMNS)}
     FROM candidate_feedback
-    WHERE avg_rating >= {rating_threshold}
+    WHERE avg_rating >= ?
     AND feedback_count >= 2
     AND hire_votes >= 1
     ORDER BY avg_rating DESC, hire_votes DESC
     LIMIT 50
     """
     
-    df = conn.execute(query).df()
-    conn.close()
+    df = _arrow_df(conn.execute(query, [float(rating_threshold)]))
+    if own_conn:
+        conn.close()
     
     return df
 
 
-def get_rejection_characteristics() -> pd.DataFrame:
+def get_rejection_characteristics(conn=None) -> pd.DataFrame:
     """Analyze characteristics of rejected candidates."""
-    conn = get_db_connection()
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
     
     query = """
     SELECT 
@@ -377,94 +533,123 @@ def get_rejection_characteristics() -> pd.DataFrame:
     """
     
     df = conn.execute(query).df()
-    conn.close()
+    if own_conn:
+        conn.close()
     
     return df
 
 
-def get_dissenting_votes(department: str = None) -> pd.DataFrame:
+DISSENTING_VOTE_COLUMNS = [
+    'application_id', 'candidate_name', 'department', 'current_stage_name', 'archive_reason',
+    'total_votes', 'yes_votes', 'no_votes', 'vote_details'
+]
+
+
+def get_dissenting_votes(department: str = None, columns: list = None, conn=None) -> pd.DataFrame:
     """
     Find candidates where interviewers disagreed (some Yes, some No).
     These are contentious decisions worth reviewing.
+    Pass `columns` (from DISSENTING_VOTE_COLUMNS) to return only those.
+    Pass a `conn` with fn_feedback already loaded to reuse it (department is then ignored).
     """
-    conn = get_db_connection()
-    
-    dept_filter = f"AND a.department = '{department}'" if department else ""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        _load_fn_feedback(conn, department)
     
     query = f"""
     WITH vote_summary AS (
         SELECT 
-            f.application_id,
-            a.candidate_name,
-            a.department,
-            a.current_stage_name,
-            a.archive_reason,
+            application_id,
+            candidate_name,
+            department,
+            current_stage_name,
+            archive_reason,
             COUNT(*) as total_votes,
-            SUM(CASE WHEN f.vote IN ('Yes', 'Strong Yes') THEN 1 ELSE 0 END) as yes_votes,
-            SUM(CASE WHEN f.vote IN ('No', 'Strong No') THEN 1 ELSE 0 END) as no_votes,
-            STRING_AGG(f.interviewer_name || ': ' || COALESCE(f.vote, 'N/A'), ' | ') as vote_details
-        FROM feedback f
-        JOIN applications a ON f.application_id = a.id
-        WHERE f.vote IS NOT NULL
-        {dept_filter}
-        GROUP BY f.application_id, a.candidate_name, a.department, a.current_stage_name, a.archive_reason
+            SUM(CASE WHEN vote IN ('Yes', 'Strong Yes') THEN 1 ELSE 0 END) as yes_votes,
+            SUM(CASE WHEN vote IN ('No', 'Strong No') THEN 1 ELSE 0 END) as no_votes,
+            STRING_AGG(interviewer_name || ': ' || COALESCE(vote, 'N/A'), ' | ') as vote_details
+        FROM fn_feedback
+        WHERE vote IS NOT NULL
+        GROUP BY application_id, candidate_name, department, current_stage_name, archive_reason
     )
-    SELECT *
+    SELECT {_select_list(columns, DISSENTING_VOTE_COLUMNS)}
     FROM vote_summary
     WHERE yes_votes >= 1 AND no_votes >= 1
     ORDER BY total_votes DESC, yes_votes DESC
     LIMIT 50
     """
     
-    df = conn.execute(query).df()
-    conn.close()
+    df = _arrow_df(conn.execute(query))
+    if own_conn:
+        conn.close()
     return df
 
 
-def get_close_call_decisions(department: str = None) -> pd.DataFrame:
+CLOSE_CALL_COLUMNS = [
+    'application_id', 'candidate_name', 'department', 'current_stage_name', 'archive_reason',
+    'feedback_count', 'avg_rating', 'min_rating', 'max_rating'
+]
+
+
+def get_close_call_decisions(department: str = None, columns: list = None, conn=None) -> pd.DataFrame:
     """
     Find candidates with borderline average ratings (2.5 - 3.5 on 1-4 scale).
     These are close calls that could have gone either way.
+    Pass `columns` (from CLOSE_CALL_COLUMNS) to return only those.
+    Pass a `conn` with fn_feedback already loaded to reuse it (department is then ignored).
     """
-    conn = get_db_connection()
-    
-    dept_filter = f"AND a.department = '{department}'" if department else ""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+        _load_fn_feedback(conn, department)
     
     query = f"""
-    SELECT 
-        f.application_id,
-        a.candidate_name,
-        a.department,
-        a.current_stage_name,
-        a.archive_reason,
-        COUNT(*) as feedback_count,
-        ROUND(AVG(f.overall_rating), 2) as avg_rating,
-        MIN(f.overall_rating) as min_rating,
-        MAX(f.overall_rating) as max_rating
-    FROM feedback f
-    JOIN applications a ON f.application_id = a.id
-    WHERE f.overall_rating IS NOT NULL
-    {dept_filter}
-    GROUP BY f.application_id, a.candidate_name, a.department, a.current_stage_name, a.archive_reason
-    HAVING AVG(f.overall_rating) BETWEEN 2.5 AND 3.5
-    AND COUNT(*) >= 2
+    WITH close_calls AS (
+        SELECT 
+            application_id,
+            candidate_name,
+            department,
+            current_stage_name,
+            archive_reason,
+            COUNT(*) as feedback_count,
+            ROUND(AVG(overall_rating), 2) as avg_rating,
+            MIN(overall_rating) as min_rating,
+            MAX(overall_rating) as max_rating
+        FROM fn_feedback
+        WHERE overall_rating IS NOT NULL
+        GROUP BY application_id, candidate_name, department, current_stage_name, archive_reason
+        HAVING AVG(overall_rating) BETWEEN 2.5 AND 3.5
+        AND COUNT(*) >= 2
+    )
+    SELECT {_select_list(columns, CLOSE_CALL_COLUMNS)}
+    FROM close_calls
     ORDER BY avg_rating DESC
     LIMIT 50
     """
     
-    df = conn.execute(query).df()
-    conn.close()
+    df = _arrow_df(conn.execute(query))
+    if own_conn:
+        conn.close()
     return df
 
 
-def get_rehire_patterns(department: str = None) -> pd.DataFrame:
+REHIRE_COLUMNS = [
+    'candidate_id', 'candidate_name', 'department', 'current_stage_name', 'archive_reason',
+    'created_at', 'total_applications'
+]
+
+
+def get_rehire_patterns(department: str = None, columns: list = None, conn=None) -> pd.DataFrame:
     """
     Find candidates who applied multiple times.
     Compare their outcomes across applications.
+    Pass `columns` (from REHIRE_COLUMNS) to return only those; every row
+    also carries `unique_candidates`, the distinct candidates shown.
     """
-    conn = get_db_connection()
-    
-    dept_filter = f"WHERE a.department = '{department}'" if department else ""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
     
     query = f"""
     WITH multi_applicants AS (
@@ -473,37 +658,53 @@ def get_rehire_patterns(department: str = None) -> pd.DataFrame:
         WHERE candidate_id IS NOT NULL
         GROUP BY candidate_id
         HAVING COUNT(*) > 1
+    ),
+    rehires AS (
+        SELECT 
+            a.candidate_id,
+            a.candidate_name,
+            a.department,
+            a.current_stage_name,
+            a.archive_reason,
+            a.created_at,
+            (SELECT COUNT(*) FROM applications a2 WHERE a2.candidate_id = a.candidate_id) as total_applications
+        FROM applications a
+        JOIN multi_applicants ma ON a.candidate_id = ma.candidate_id
+        WHERE (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
+    ),
+    shown AS (
+        SELECT *
+        FROM rehires
+        ORDER BY candidate_id, created_at
+        LIMIT 100
     )
     SELECT 
-        a.candidate_id,
-        a.candidate_name,
-        a.department,
-        a.current_stage_name,
-        a.archive_reason,
-        a.created_at,
-        (SELECT COUNT(*) FROM applications a2 WHERE a2.candidate_id = a.candidate_id) as total_applications
-    FROM applications a
-    JOIN multi_applicants ma ON a.candidate_id = ma.candidate_id
-    {dept_filter}
-    ORDER BY a.candidate_id, a.created_at
-    LIMIT 100
+        {_select_list(columns, REHIRE_COLUMNS)},
+        (SELECT COUNT(DISTINCT candidate_id) FROM shown) as unique_candidates
+    FROM shown
+    ORDER BY candidate_id, created_at
     """
     
-    df = conn.execute(query).df()
-    conn.close()
+    df = _arrow_df(conn.execute(query, [department, department]))
+    if own_conn:
+        conn.close()
     return df
 
 
-def get_archive_reason_analysis(department: str = None) -> pd.DataFrame:
+# Archive reasons that suggest we lost a good candidate
+ARCHIVE_SIGNALS = ['Future Candidate', 'Accepted Other Offer', 'Timing', 'Withdrew']
+
+
+def get_archive_reason_analysis(department: str = None, conn=None) -> pd.DataFrame:
     """
     Analyze archive reasons that suggest false negatives.
     'Future Candidate' and 'Accepted Other Offer' are signals.
     """
-    conn = get_db_connection()
-    
-    dept_filter = f"AND department = '{department}'" if department else ""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
     
-    query = f"""
+    query = """
     SELECT 
         archive_reason,
         COUNT(*) as count,
@@ -512,20 +713,62 @@ def get_archive_reason_analysis(department: str = None) -> pd.DataFrame:
     WHERE current_stage_name = 'Archived'
     AND archive_reason IS NOT NULL
     AND archive_reason != ''
-    {dept_filter}
+    AND (CAST(? AS VARCHAR) IS NULL OR department = ?)
     GROUP BY archive_reason
     ORDER BY count DESC
     """
     
-    df = conn.execute(query).df()
-    conn.close()
+    df = conn.execute(query, [department, department]).df()
+    if own_conn:
+        conn.close()
     return df
 
 
+def get_archive_signal_counts(department: str = None, conn=None) -> dict:
+    """
+    Count archived candidates whose reason mentions each of ARCHIVE_SIGNALS.
+    
+    Returns:
+        dict of ARCHIVE_SIGNALS -> candidate count, from one scan of applications
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+    
+    signal_cols = ",\n        ".join(
+        "COUNT(*) FILTER (WHERE archive_reason ILIKE ?)" for _ in ARCHIVE_SIGNALS
+    )
+    query = f"""
+    SELECT 
+        {signal_cols}
+    FROM applications
+    WHERE current_stage_name = 'Archived'
+    AND archive_reason IS NOT NULL
+    AND archive_reason != ''
+    AND (CAST(? AS VARCHAR) IS NULL OR department = ?)
+    """
+    
+    params = [f"%{signal}%" for signal in ARCHIVE_SIGNALS] + [department, department]
+    signal_row = conn.execute(query, params).fetchone()
+    if own_conn:
+        conn.close()
+    
+    return dict(zip(ARCHIVE_SIGNALS, signal_row))
+
+
 # =============================================================================
 # TAB 4: INTERVIEWER CALIBRATION
 # =============================================================================
 
+# calibration_code values and their display labels
+CALIBRATION_HAWK, CALIBRATION_DOVE, CALIBRATION_CALIBRATED = 0, 1, 2
+CALIBRATION_LABELS = {
+    CALIBRATION_HAWK: '🦅 Hawk (Strict)',
+    CALIBRATION_DOVE: '🕊️ Dove (Lenient)',
+    CALIBRATION_CALIBRATED: '✅ Calibrated',
+}
+
+
 def calculate_interviewer_calibration(department: str = None) -> pd.DataFrame:
     """
     Calculate interviewer calibration metrics for key interview stages.
@@ -547,11 +790,9 @@ def calculate_interviewer_calibration(department: str = None) -> pd.DataFrame:
     except:
         pass
     
-    dept_filter = f"AND a.department = '{department}'" if department else ""
-    
     if has_history:
         # Filter to only specific interview stages
-        query = f"""
+        query = """
         WITH operator_applications AS (
             SELECT DISTINCT application_id
             FROM application_history
@@ -573,14 +814,14 @@ def calculate_interviewer_calibration(department: str = None) -> pd.DataFrame:
         JOIN applications a ON f.application_id = a.id
         JOIN operator_applications oa ON f.application_id = oa.application_id
         WHERE f.vote IS NOT NULL
-        {dept_filter}
+        AND (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
         GROUP BY f.interviewer_id, f.interviewer_name
         HAVING COUNT(*) >= 5
         ORDER BY approval_rate DESC
         """
     else:
         # Fallback without history - just use department filter
-        query = f"""
+        query = """
         SELECT 
             f.interviewer_id,
             f.interviewer_name,
@@ -592,13 +833,13 @@ def calculate_interviewer_calibration(department: str = None) -> pd.DataFrame:
         FROM feedback f
         JOIN applications a ON f.application_id = a.id
         WHERE f.vote IS NOT NULL
-        {dept_filter}
+        AND (CAST(? AS VARCHAR) IS NULL OR a.department = ?)
         GROUP BY f.interviewer_id, f.interviewer_name
         HAVING COUNT(*) >= 5
         ORDER BY approval_rate DESC
         """
     
-    df = conn.execute(query).df()
+    df = conn.execute(query, [department, department]).df()
     conn.close()
     
     if len(df) == 0:
@@ -614,10 +855,12 @@ def calculate_interviewer_calibration(department: str = None) -> pd.DataFrame:
         df['z_score'] = 0
     
     # Classify as Hawk/Dove/Calibrated
-    df['calibration'] = df['z_score'].apply(
-        lambda z: '🦅 Hawk (Strict)' if z < -1.5 
-        else ('🕊️ Dove (Lenient)' if z > 1.5 else '✅ Calibrated')
+    df['calibration_code'] = np.select(
+        [df['z_score'] < -1.5, df['z_score'] > 1.5],
+        [CALIBRATION_HAWK, CALIBRATION_DOVE],
+        default=CALIBRATION_CALIBRATED
     )
+    df['calibration'] = df['calibration_code'].map(CALIBRATION_LABELS)
     
     return df
 
@@ -656,11 +899,9 @@ def analyze_false_positives(department: str = None) -> pd.DataFrame:
     """
     conn = get_db_connection()
     
-    dept_filter = f"AND e.department = '{department}'" if department else ""
-    
     # Check if employees table exists
     try:
-        query = f"""
+        query = """
         SELECT 
             e.employee_id,
             e.candidate_name,
@@ -674,11 +915,11 @@ def analyze_false_positives(department: str = None) -> pd.DataFrame:
         WHERE e.departure_date IS NOT NULL
         AND e.tenure_days IS NOT NULL
         AND e.tenure_days < 365
-        {dept_filter}
+        AND (CAST(? AS VARCHAR) IS NULL OR e.department = ?)
         ORDER BY e.tenure_days ASC
         """
         
-        df = conn.execute(query).df()
+        df = _arrow_df(conn.execute(query, [department, department]))
     except:
         df = pd.DataFrame()
     
@@ -694,9 +935,7 @@ def get_false_positive_feedback(employee_application_ids: list) -> pd.DataFrame:
     
     conn = get_db_connection()
     
-    ids_str = "', '".join(employee_application_ids)
-    
-    query = f"""
+    query = """
     SELECT 
         f.application_id,
         f.interviewer_name,
@@ -704,10 +943,10 @@ def get_false_positive_feedback(employee_application_ids: list) -> pd.DataFrame:
         f.overall_rating,
         f.feedback_text
     FROM feedback f
-    WHERE f.application_id IN ('{ids_str}')
+    WHERE list_contains(?, f.application_id)
     """
     
-    df = conn.execute(query).df()
+    df = conn.execute(query, [list(employee_application_ids)]).df()
     conn.close()
     
     return df
@@ -9,7 +9,7 @@ import duckdb
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from etl import AshbyAPI, ASHBY_API_KEY, transform_applications
+from etl import AshbyAPI, ASHBY_API_KEY, LOAD_DB_CONFIG, transform_applications, export_parquet
 
 def main():
     if not ASHBY_API_KEY:
@@ -64,16 +64,21 @@ def main():
     # Save to database
     print("\n💾 Saving to DuckDB...")
     db_path = os.path.join(os.path.dirname(__file__), 'data', 'interview_analytics.duckdb')
-    conn = duckdb.connect(db_path)
+    conn = duckdb.connect(db_path, config=LOAD_DB_CONFIG)
     
-    # Drop and recreate applications table
+    # Drop and recreate applications table in one transaction
+    conn.begin()
     conn.execute("DROP TABLE IF EXISTS applications")
     conn.execute("CREATE TABLE applications AS SELECT * FROM apps_df")
+    conn.commit()
     
     # Verify
     result = conn.execute("SELECT COUNT(*), COUNT(DISTINCT department) FROM applications").fetchone()
     print(f"   Saved {result[0]} rows with {result[1]} distinct departments")
     
+    # Keep the dashboard's Parquet copy in sync
+    export_parquet(conn)
+    
     conn.close()
     print("✅ Applications table updated successfully!")
 
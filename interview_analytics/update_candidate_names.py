@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from etl import AshbyAPI
 import duckdb
+import pandas as pd
 from pathlib import Path
 
 DB_PATH = Path(__file__).parent / "data" / "interview_analytics.duckdb"
@@ -64,13 +65,16 @@ def main():
         print("Updating database...")
         conn = duckdb.connect(str(DB_PATH))
         
-        # Just update candidate_name, skip candidate_id since it has type mismatch
-        for name, cand_id, app_id in updates:
-            conn.execute("""
-                UPDATE applications 
-                SET candidate_name = ?
-                WHERE id = ?
-            """, [name, app_id])
+        # Just update candidate_name, skip candidate_id since it has type mismatch.
+        # One set-based UPDATE joined against the registered DataFrame, not one per row.
+        conn.register('temp_names', pd.DataFrame(updates, columns=['candidate_name', 'candidate_id', 'id']))
+        conn.execute("""
+            UPDATE applications 
+            SET candidate_name = temp_names.candidate_name
+            FROM temp_names
+            WHERE applications.id = temp_names.id
+        """)
+        conn.unregister('temp_names')
         
         conn.commit()
         conn.close()
@@ -10,7 +10,7 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from etl import AshbyAPI, ASHBY_API_KEY, DB_PATH
+from etl import AshbyAPI, ASHBY_API_KEY, DB_PATH, LOAD_DB_CONFIG
 
 def run_department_update():
     print("=" * 60)
@@ -77,7 +77,10 @@ def run_department_update():
     # Save to DuckDB
     print(f"\n💾 Saving to DuckDB: {DB_PATH}")
     
-    conn = duckdb.connect(str(DB_PATH))
+    conn = duckdb.connect(str(DB_PATH), config=LOAD_DB_CONFIG)
+    
+    # Tables and the applications rebuild land in one transaction
+    conn.begin()
     
     # Save departments table
     conn.register('temp_depts', depts_df)
@@ -101,6 +104,7 @@ def run_department_update():
         FROM applications a
         LEFT JOIN jobs j ON CAST(a.job_id AS VARCHAR) = CAST(j.id AS VARCHAR)
     """)
+    conn.commit()
     
     # Verify
     depts_count = conn.execute("SELECT COUNT(*) FROM departments").fetchone()[0]
@@ -8,7 +8,7 @@ import duckdb
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from etl import AshbyAPI, ASHBY_API_KEY, transform_feedback
+from etl import AshbyAPI, ASHBY_API_KEY, LOAD_DB_CONFIG, transform_feedback
 
 def main():
     if not ASHBY_API_KEY:
@@ -17,42 +17,59 @@ def main():
     
     api = AshbyAPI(ASHBY_API_KEY)
     
-    # Fetch feedback 
-    print("📥 Fetching feedback from API...")
-    raw_feedback = api.get_application_feedback()
-    print(f"   Found {len(raw_feedback)} feedback entries")
+    # Stream feedback into DuckDB a page at a time; the pinned schema in
+    # transform_feedback keeps every page's columns identical
+    db_path = os.path.join(os.path.dirname(__file__), 'data', 'interview_analytics.duckdb')
+    conn = duckdb.connect(db_path, config=LOAD_DB_CONFIG)
+    
+    # Drop and recreate feedback table, all in one transaction so a failed fetch keeps the old table
+    conn.begin()
+    conn.execute("DROP TABLE IF EXISTS feedback")
+    
+    print("📥 Fetching and transforming feedback from API...")
+    total = 0
+    pagination = {}
+    for raw_page in api.iter_application_feedback_pages(sync=pagination):
+        if not raw_page:
+            continue
+        page_df = transform_feedback(raw_page, [])
+        if total == 0:
+            conn.execute("CREATE TABLE feedback AS SELECT * FROM page_df")
+        else:
+            conn.execute("INSERT INTO feedback SELECT * FROM page_df")
+        total += len(page_df)
+    print(f"   Found {total} feedback entries")
     
-    if not raw_feedback:
+    # An API error mid-way ends the pages early; don't replace the table with a partial one
+    if not pagination.get('complete'):
+        conn.rollback()
+        conn.close()
+        print("❌ Feedback fetch stopped before the last page; kept the existing table.")
+        sys.exit(1)
+    
+    if not total:
+        conn.rollback()
+        conn.close()
         print("❌ No feedback data returned. Check your ASHBY_API_KEY.")
         sys.exit(1)
     
-    # Transform with corrected parsing
-    print("🔄 Transforming feedback with corrected parsing...")
-    feedback_df = transform_feedback(raw_feedback, [])
+    conn.commit()
     
     # Show sample of parsed data
     print("\n📊 Sample of parsed feedback:")
-    sample_cols = ['overall_rating', 'vote', 'interviewer_name']
-    print(feedback_df[sample_cols].head(5).to_string())
-    
-    print(f"\n✅ Non-null counts:")
-    print(f"   overall_rating: {feedback_df['overall_rating'].notna().sum()}/{len(feedback_df)}")
-    print(f"   vote: {feedback_df['vote'].notna().sum()}/{len(feedback_df)}")
-    print(f"   feedback_text: {(feedback_df['feedback_text'] != '').sum()}/{len(feedback_df)}")
-    
-    # Save to database
-    print("\n💾 Saving to DuckDB...")
-    db_path = os.path.join(os.path.dirname(__file__), 'data', 'interview_analytics.duckdb')
-    conn = duckdb.connect(db_path)
-    
-    # Drop and recreate feedback table
-    conn.execute("DROP TABLE IF EXISTS feedback")
-    conn.execute("CREATE TABLE feedback AS SELECT * FROM feedback_df")
+    print(conn.execute("SELECT overall_rating, vote, interviewer_name FROM feedback LIMIT 5").df().to_string())
     
     # Verify
-    result = conn.execute("SELECT COUNT(*), COUNT(overall_rating), COUNT(vote) FROM feedback").fetchone()
-    print(f"   Saved {result[0]} rows, {result[1]} with ratings, {result[2]} with votes")
+    result = conn.execute("""
+        SELECT COUNT(*), COUNT(overall_rating), COUNT(vote), COUNT(*) FILTER (WHERE feedback_text != '')
+        FROM feedback
+    """).fetchone()
+    print(f"\n✅ Non-null counts:")
+    print(f"   overall_rating: {result[1]}/{result[0]}")
+    print(f"   vote: {result[2]}/{result[0]}")
+    print(f"   feedback_text: {result[3]}/{result[0]}")
     
+    api.close()
     conn.close()
     print("✅ Feedback table updated successfully!")
 
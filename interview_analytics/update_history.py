@@ -11,7 +11,7 @@ import duckdb
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from etl import AshbyAPI, ASHBY_API_KEY, transform_application_history
+from etl import AshbyAPI, ASHBY_API_KEY, LOAD_DB_CONFIG, transform_application_history, refresh_stage_cohorts
 
 def main():
     if not ASHBY_API_KEY:
@@ -22,7 +22,7 @@ def main():
     
     # Get application IDs from existing database (faster than re-fetching)
     db_path = os.path.join(os.path.dirname(__file__), 'data', 'interview_analytics.duckdb')
-    conn = duckdb.connect(db_path)
+    conn = duckdb.connect(db_path, config=LOAD_DB_CONFIG)
     
     print("📥 Getting application IDs from database...")
     app_ids = conn.execute("SELECT id FROM applications").fetchall()
@@ -32,23 +32,12 @@ def main():
     # Limit for testing - remove this for full fetch
     # app_ids = app_ids[:100]  # Uncomment to test with first 100
     
-    # Fetch history for all applications
+    # Fetch history for all applications (concurrently, see AshbyAPI.get_application_history)
     print("\n📥 Fetching application history from Ashby API...")
     print("   (This may take a while for large datasets...)")
     
-    all_history = []
-    batch_size = 50
-    
-    for i in range(0, len(app_ids), batch_size):
-        batch = app_ids[i:i+batch_size]
-        print(f"   Processing applications {i+1}-{min(i+batch_size, len(app_ids))} of {len(app_ids)}...")
-        
-        for app_id in batch:
-            result = api._post('application.listHistory', {'applicationId': app_id})
-            if result and result.get('results'):
-                for entry in result.get('results', []):
-                    entry['applicationId'] = app_id
-                all_history.extend(result.get('results', []))
+    all_history = api.get_application_history(app_ids)
+    api.close()
     
     print(f"\n✅ Fetched {len(all_history)} history entries")
     
@@ -71,9 +60,15 @@ def main():
     
     # Save to database
     print("\n💾 Saving to DuckDB...")
+    conn.begin()
     conn.execute("DROP TABLE IF EXISTS application_history")
     conn.execute("CREATE TABLE application_history AS SELECT * FROM history_df")
-    
+
+    # Derived cohort tables the dashboard joins against
+    print("🔄 Refreshing stage cohorts...")
+    refresh_stage_cohorts(conn)
+    conn.commit()
+
     # Show stage transition stats
     print("\n📊 Stage transition counts:")
     print(conn.execute("""
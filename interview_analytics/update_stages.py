@@ -10,7 +10,7 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from etl import AshbyAPI, ASHBY_API_KEY, DB_PATH, transform_stages
+from etl import AshbyAPI, ASHBY_API_KEY, DB_PATH, LOAD_DB_CONFIG, transform_stages
 
 def run_stages_only():
     print("=" * 60)
@@ -87,7 +87,10 @@ def run_stages_only():
     # Save to DuckDB
     print(f"\n💾 Saving to DuckDB: {DB_PATH}")
     
-    conn = duckdb.connect(str(DB_PATH))
+    conn = duckdb.connect(str(DB_PATH), config=LOAD_DB_CONFIG)
+    
+    # Both tables land in one transaction
+    conn.begin()
     
     # Save interview_plans table
     conn.register('temp_plans', plans_df)
@@ -96,6 +99,7 @@ def run_stages_only():
     # Save stages table  
     conn.register('temp_stages', stages_df)
     conn.execute("CREATE OR REPLACE TABLE stages AS SELECT * FROM temp_stages")
+    conn.commit()
     
     # Verify
     plans_count = conn.execute("SELECT COUNT(*) FROM interview_plans").fetchone()[0]